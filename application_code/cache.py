@@ -0,0 +1,99 @@
+# This file contains a snapshot cache for data read from the spreadsheets. Parsing the .ods files is the slowest
+# part of updating the lexicon, so the processed rows are stored in a binary snapshot together with a fingerprint
+# of the source file. When the spreadsheet hasn't changed the snapshot is loaded instead of parsing it again.
+import hashlib
+import logging
+import os
+import pickle
+
+logger = logging.getLogger("LexiconLog")
+
+# Increase when the shape of the cached data changes so old snapshots are ignored
+CACHE_VERSION = 2
+SNAPSHOT_EXTENSION = ".snapshot"
+
+
+def hash_file(path, block_size=1 << 20):
+    """Return the sha1 hex digest of a file's contents, read in blocks to keep memory flat."""
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def hash_value(value):
+    """Return the sha1 hex digest of a value's repr, used to spot rows and entries that have changed. Only use it
+    for values with a stable repr (strings, numbers, dates and lists, tuples or dicts of them)."""
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()
+
+
+def snapshot_path(cache_folder, source, kind):
+    """Return the path of the snapshot file used for a source spreadsheet. kind distinguishes different data
+    read from the same file, e.g. 'lexicon' or 'verbs'."""
+    name = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()
+    return os.path.join(
+        cache_folder,
+        "{kind}_{name}{ext}".format(kind=kind, name=name, ext=SNAPSHOT_EXTENSION),
+    )
+
+
+def load_snapshot(cache_folder, source, kind, key):
+    """Return the cached data for source or None if there is no valid snapshot. key describes the settings used
+    to read the data (sheet name, column layout...) and must match the key the snapshot was stored with.
+    A snapshot is valid if the source has the same mtime and size, or failing that the same content hash."""
+    path = snapshot_path(cache_folder, source, kind)
+    try:
+        with open(path, "rb") as file:
+            snapshot = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        logger.warning("   -Ignoring unreadable cache file {p}".format(p=path))
+        return None
+
+    if snapshot.get("version") != CACHE_VERSION or snapshot.get("key") != key:
+        return None
+    stat = os.stat(source)
+    if snapshot["size"] != stat.st_size:
+        return None
+    if snapshot["mtime"] != stat.st_mtime_ns:
+        # The file was saved again, only trust the snapshot if the contents are the same
+        if snapshot["hash"] != hash_file(source):
+            return None
+        snapshot["mtime"] = stat.st_mtime_ns
+        write_snapshot(path, snapshot)
+    return snapshot["data"]
+
+
+def store_snapshot(cache_folder, source, kind, key, data):
+    """Store data read from source in the cache folder."""
+    os.makedirs(cache_folder, exist_ok=True)
+    stat = os.stat(source)
+    snapshot = {
+        "version": CACHE_VERSION,
+        "key": key,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "hash": hash_file(source),
+        "data": data,
+    }
+    write_snapshot(snapshot_path(cache_folder, source, kind), snapshot)
+
+
+def write_snapshot(path, snapshot):
+    """Write the snapshot to a temporary file and move it into place so a crash never leaves half a snapshot."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def clear_cache(cache_folder):
+    """Delete every snapshot in the cache folder, forcing the spreadsheets to be read again."""
+    if not cache_folder or not os.path.isdir(cache_folder):
+        return
+    for file in os.listdir(cache_folder):
+        if file.endswith(SNAPSHOT_EXTENSION):
+            os.remove(os.path.join(cache_folder, file))
+    logger.info("   -Cache cleared")
@@ -0,0 +1,111 @@
+# This file contains the collation (alphabetical ordering) rules used to sort the dictionary. Each language can set
+# its alphabet order and the characters that sort as another letter in lexicon_config.py. The rules are compiled
+# once into a str.translate table so working out a sort key is a single pass over the word.
+import functools
+import sys
+import unicodedata
+
+try:
+    import lexicon_config
+except ModuleNotFoundError:
+    import example_lexicon_config as lexicon_config
+
+# Used when collation_equivalences isn't set: phonetic characters sort with the closest plain letter
+DEFAULT_EQUIVALENCES = {
+    "ɛ": "e",
+    "β": "b",
+    "ə": "e",
+    "ɑ": "a",
+    "ʔ": "k",
+    "ɔ": "o",
+}
+# Added to the collation equivalences for searching when search_equivalences isn't set, so search keys are plain
+# ASCII that can be typed on any phone. ŋ can't be a collation equivalence as it would then sort as n
+SEARCH_EQUIVALENCES = {"ŋ": "ng"}
+# Letters of the alphabet are translated to private use characters from here, in alphabet order
+RANK_START = 0xE000
+
+
+class RankTable(dict):
+    """A str.translate table for an alphabet. Letters that aren't in the alphabet are translated to characters
+    after its last letter, in their Unicode order, so they sort after it. Other characters such as spaces and
+    hyphens are left as they are and sort before every letter. Ranks are added to the table as they're found."""
+
+    def __init__(self, alphabet):
+        super().__init__()
+        for letter in alphabet:
+            self.setdefault(ord(letter), chr(RANK_START + len(self)))
+        self.after = RANK_START + len(self)
+
+    def __missing__(self, code):
+        character = chr(code)
+        if unicodedata.category(character).startswith("L"):
+            character = chr(min(self.after + code, sys.maxunicode))
+        self[code] = character
+        return character
+
+
+class Collator:
+    """Sort keys for one language. alphabet is the letters in order (a string or list of single characters),
+    None sorts letters by their Unicode order. equivalences maps characters to the letter(s) they sort as.
+    Letters not in the alphabet sort after every letter in it, other characters before them all.
+    search_equivalences maps characters to the letter(s) they're replaced by in search keys, by default the
+    equivalences plus SEARCH_EQUIVALENCES."""
+
+    def __init__(self, alphabet=None, equivalences=None, search_equivalences=None):
+        if equivalences is None:
+            equivalences = DEFAULT_EQUIVALENCES
+        if search_equivalences is None:
+            search_equivalences = {**SEARCH_EQUIVALENCES, **equivalences}
+        self.table = RankTable(alphabet) if alphabet else {}
+        ranked = {
+            character: letters.translate(self.table)
+            for character, letters in equivalences.items()
+        }
+        for character, letters in ranked.items():
+            self.table[ord(character)] = letters
+        self.fold_table = str.maketrans(search_equivalences)
+
+    def primary_key(self, word):
+        """The word as it sorts, ignoring case, accents and equivalent characters. Accented letters are split
+        (NFD) first, so the key doesn't depend on how the word was typed."""
+        word = unicodedata.normalize("NFD", word.lower()).translate(self.table)
+        return "".join(c for c in word if not unicodedata.combining(c))
+
+    def search_key(self, word):
+        """The word folded for searching: lower case, search equivalences replaced and accents removed, so
+        typing ele finds ɛ̃lɛ and limong finds limoŋ."""
+        word = unicodedata.normalize("NFD", word.lower()).translate(self.fold_table)
+        return "".join(c for c in word if not unicodedata.combining(c))
+
+    def sort_key(self, word):
+        """A multi-level key: words sort by letter first, then accents and equivalent characters (e before ɛ and
+        ɛ̃) and then case."""
+        word = unicodedata.normalize("NFD", word)
+        return self.primary_key(word), word.lower(), word
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_collator(alphabet, equivalences, search_equivalences):
+    return Collator(
+        alphabet,
+        None if equivalences is None else dict(equivalences),
+        None if search_equivalences is None else dict(search_equivalences),
+    )
+
+
+def get_collator(settings=None):
+    """Return the Collator for the alphabet, collation_equivalences and search_equivalences settings, compiled
+    once per set of rules."""
+    settings = settings or lexicon_config.settings
+    alphabet = settings.get("alphabet")
+    return compiled_collator(
+        tuple(alphabet) if alphabet else None,
+        hashable(settings.get("collation_equivalences")),
+        hashable(settings.get("search_equivalences")),
+    )
+
+
+def hashable(equivalences):
+    """Equivalences as a tuple that compiled_collator() can cache, or None if they aren't set."""
+    return None if equivalences is None else tuple(sorted(equivalences.items()))
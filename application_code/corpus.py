@@ -0,0 +1,93 @@
+# This file contains the corpus scanner used by lexicon.py --scan-corpus to find words missing from the lexicon.
+# Transcribed texts are read a chunk at a time and split into words, each is looked up in a set of every form in
+# the lexicon and the verb paradigms, and the words that aren't found are counted. Files are scanned in parallel.
+import csv
+import logging
+import re
+from collections import Counter
+
+from application_code import collation
+from application_code import parallel
+from application_code import process_data
+
+logger = logging.getLogger("LexiconLog")
+
+CHUNK_SIZE = 1 << 20  # characters read from a text at a time
+REPORT_FILE = "missing_words.csv"
+# Letters (including phonetic characters such as ʔ) and the accents that go with them
+LETTER = re.compile(r"[^\W\d_]|[\u0300-\u036f]")
+TOKEN = re.compile(r"(?:[^\W\d_]|[\u0300-\u036f])+")
+
+
+def known_forms(processed_data, verb_data=None):
+    """Return the set of search keys (see Collator.search_key()) of every phonetic, orthographic and dialect form
+    in the lexicon and every conjugated form in the verb paradigms."""
+    collator = collation.get_collator()
+    forms = set()
+    for r in processed_data:
+        forms.update(collator.search_key(str(w)) for w in (r.phon, r.orth, r.dial) if w)
+    if verb_data:
+        forms.update(
+            collator.search_key(w)
+            for w in process_data.get_verb_conjugations(verb_data)
+        )
+    return forms
+
+
+def chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield the lower case text of a file object about chunk_size characters at a time, so memory use doesn't
+    grow with the size of the file or the length of its lines. A word cut off at the end of a chunk is moved to
+    the start of the next."""
+    tail = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        text = tail + chunk
+        cut = len(text)
+        while cut and LETTER.match(text, cut - 1):
+            cut -= 1
+        text, tail = text[:cut], text[cut:]
+        yield text.lower()
+    yield tail.lower()
+
+
+def scan_file(path, known, chunk_size=CHUNK_SIZE):
+    """Return (Counter of the words in the file at path that aren't in known, number of words in the file)."""
+    collator = collation.get_collator()
+    words = Counter()
+    with open(path, encoding="utf-8") as file:
+        for text in chunks(file, chunk_size):
+            words.update(TOKEN.findall(text))
+    # the texts use the same words over and over, so each different word is only looked up once
+    unknown = Counter(
+        {w: n for w, n in words.items() if collator.search_key(w) not in known}
+    )
+    return unknown, sum(words.values())
+
+
+def scan_corpus(paths, known, processes=None):
+    """Scan the text files in paths, spread over a pool of processes (see parallel.run_jobs()). Returns
+    (Counter of the unknown words in all files, number of words scanned)."""
+    jobs = {path: (scan_file, {"path": path, "known": known}) for path in paths}
+    results, timings, _ = parallel.run_jobs(jobs, processes=processes)
+    unknown = Counter()
+    count = 0
+    for path, (file_unknown, file_count) in results.items():
+        logger.info(
+            "   -{p}: {c} words, {u} unknown, scanned in {s:.2f}s".format(
+                p=path, c=file_count, u=sum(file_unknown.values()), s=timings[path]
+            )
+        )
+        unknown.update(file_unknown)
+        count += file_count
+    return unknown, count
+
+
+def write_report(unknown, path):
+    """Write the unknown words and how often they were used to a .csv file, most frequent first."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["word", "count"])
+        writer.writerows(unknown.most_common())
+    return path
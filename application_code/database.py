@@ -0,0 +1,171 @@
+# This file contains an optional SQLite store that mirrors the lexicon and verb paradigm rows. Rows are identified
+# by a hash of their contents so syncing after an edit only writes the rows that changed, and the indexed columns
+# allow quick lookups without scanning every row in Python.
+import datetime
+import logging
+import sqlite3
+
+from application_code import cache
+from application_code.read_data import LexiconRow
+
+logger = logging.getLogger("LexiconLog")
+
+# Database column for each LexiconRow field, every name is quoted in SQL as "check" is a keyword
+LEXICON_COLUMNS = LexiconRow.fields
+VERB_COLUMNS = ("verb_id", "actor", "tense", "mode", "kov", "eng")
+INDEXED_COLUMNS = ("id", "phon", "orth", "eng", "tag", "date")
+
+
+def connect(path):
+    """Open (creating if needed) the database at path and make sure the tables and indexes exist."""
+    connection = sqlite3.connect(path)
+    lexicon_columns = ", ".join('"{c}"'.format(c=c) for c in LEXICON_COLUMNS)
+    verb_columns = ", ".join('"{c}"'.format(c=c) for c in VERB_COLUMNS)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS lexicon (row_hash TEXT PRIMARY KEY, copies INTEGER, {c})".format(
+            c=lexicon_columns
+        )
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS verbs (row_hash TEXT PRIMARY KEY, copies INTEGER, {c})".format(
+            c=verb_columns
+        )
+    )
+    for column in INDEXED_COLUMNS:
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS lexicon_{c} ON lexicon ("{c}")'.format(c=column)
+        )
+    connection.execute("CREATE INDEX IF NOT EXISTS verbs_eng ON verbs (eng)")
+    connection.execute("CREATE INDEX IF NOT EXISTS verbs_kov ON verbs (kov)")
+    connection.commit()
+    return connection
+
+
+def row_hash(values):
+    """A stable hash of a row's values, used to spot rows that have changed since the last sync."""
+    return cache.hash_value(tuple(values))
+
+
+def to_sql_value(value):
+    """Dates are stored as ISO formatted text, everything else as it is."""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def sync_rows(connection, table, columns, rows):
+    """Make table contain exactly rows. Rows are keyed by the hash of their contents, so only rows that are new
+    or have been edited are inserted, and rows no longer in the spreadsheet are deleted.
+    Returns (number of rows added, number of rows removed)."""
+    current = {}
+    for values in rows:
+        values = tuple(values)
+        h = row_hash(values)
+        if h in current:
+            current[h][0] += 1  # identical rows are stored once with a count
+        else:
+            current[h] = [1, values]
+    stored = dict(
+        connection.execute("SELECT row_hash, copies FROM {t}".format(t=table))
+    )
+
+    added = [
+        (h, copies) + tuple(to_sql_value(v) for v in values)
+        for h, (copies, values) in current.items()
+        if h not in stored
+    ]
+    recounted = [
+        (copies, h)
+        for h, (copies, _) in current.items()
+        if h in stored and stored[h] != copies
+    ]
+    removed = [(h,) for h in stored if h not in current]
+
+    column_names = ", ".join('"{c}"'.format(c=c) for c in columns)
+    placeholders = ", ".join("?" * (len(columns) + 2))
+    with connection:
+        connection.executemany(
+            "INSERT INTO {t} (row_hash, copies, {c}) VALUES ({p})".format(
+                t=table, c=column_names, p=placeholders
+            ),
+            added,
+        )
+        connection.executemany(
+            "UPDATE {t} SET copies = ? WHERE row_hash = ?".format(t=table), recounted
+        )
+        connection.executemany(
+            "DELETE FROM {t} WHERE row_hash = ?".format(t=table), removed
+        )
+    return len(added), len(removed)
+
+
+def sync_lexicon(connection, processed_data):
+    """Mirror the rows returned by read_lexicon() in the lexicon table."""
+    added, removed = sync_rows(
+        connection,
+        "lexicon",
+        LEXICON_COLUMNS,
+        (row.values() for row in processed_data),
+    )
+    logger.info(
+        "   -Database lexicon synced: {a} rows added, {r} rows removed".format(
+            a=added, r=removed
+        )
+    )
+    return added, removed
+
+
+def sync_verbs(connection, verb_data):
+    """Mirror the rows returned by read_verbsheet() in the verbs table. Only the first 6 columns are kept."""
+    added, removed = sync_rows(
+        connection,
+        "verbs",
+        VERB_COLUMNS,
+        (row[: len(VERB_COLUMNS)] for row in verb_data),
+    )
+    logger.info(
+        "   -Database verbs synced: {a} rows added, {r} rows removed".format(
+            a=added, r=removed
+        )
+    )
+    return added, removed
+
+
+def rows_to_lexicon_rows(rows):
+    """Convert database rows back to LexiconRow objects, repeating rows that appear more than once."""
+    date_index = LEXICON_COLUMNS.index("date")
+    for copies, *values in rows:
+        date = values[date_index]
+        if isinstance(date, str) and len(date) == 10:
+            try:
+                values[date_index] = datetime.datetime.strptime(date, "%Y-%m-%d").date()
+            except ValueError:
+                pass
+        for _ in range(copies):
+            yield LexiconRow(*values)
+
+
+def read_lexicon(connection, **where):
+    """Return the lexicon rows as LexiconRow objects sorted by ID and sense. Keyword arguments select rows by
+    column e.g. read_lexicon(connection, phon="undum"), using the column indexes."""
+    for column in where:
+        if column not in LEXICON_COLUMNS:
+            raise KeyError(column)
+    conditions = " AND ".join('"{c}" = ?'.format(c=c) for c in where)
+    query = "SELECT copies, {c} FROM lexicon {w} ORDER BY id, sense".format(
+        c=", ".join('"{c}"'.format(c=c) for c in LEXICON_COLUMNS),
+        w="WHERE " + conditions if conditions else "",
+    )
+    rows = connection.execute(query, [to_sql_value(v) for v in where.values()])
+    return list(rows_to_lexicon_rows(rows))
+
+
+def repeated_values(connection, column):
+    """Return the values of column that appear in more than one row, e.g. repeated_values(connection, "phon")
+    finds duplicated words."""
+    if column not in LEXICON_COLUMNS:
+        raise KeyError(column)
+    query = 'SELECT "{c}" FROM lexicon GROUP BY "{c}" HAVING SUM(copies) > 1'.format(
+        c=column
+    )
+    return [value for (value,) in connection.execute(query)]
@@ -0,0 +1,108 @@
+# This file contains the store of rendered dictionary entries, so entries that haven't changed since an earlier
+# build are reused instead of rendered again. Fragments are kept in an SQLite database in the cache folder, keyed by
+# a hash of the entry and the templates it was rendered with. The store is kept under a size limit by removing the
+# fragments that were used least recently, so old versions of entries and templates don't build up.
+import functools
+import os
+import sqlite3
+
+STORE_NAME = "fragments.db"
+# Most keys looked up in one query, below SQLite's limit on the number of parameters
+QUERY_SIZE = 500
+
+
+class FragmentStore:
+    """Rendered fragments keyed by text, in the SQLite database at path (":memory:" keeps them in memory). Each
+    get() marks the fragments found as used by the current build. Once the fragments add up to more than
+    max_bytes, evict() removes those used least recently."""
+
+    def __init__(self, path=":memory:", max_bytes=50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fragments "
+            "(key TEXT PRIMARY KEY, html TEXT, size INTEGER, used INTEGER)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)"
+        )
+        self.connection.commit()
+        self.new_build()
+
+    def new_build(self):
+        """Start a new build, fragments used from now on count as more recently used than any before."""
+        (last,) = self.connection.execute("SELECT MAX(used) FROM fragments").fetchone()
+        self.build = (last or 0) + 1
+
+    def get(self, keys):
+        """Return {key: html} for the keys that are in the store."""
+        keys = list(keys)
+        found = {}
+        with self.connection:
+            for i in range(0, len(keys), QUERY_SIZE):
+                chunk = keys[i : i + QUERY_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                found.update(
+                    self.connection.execute(
+                        "SELECT key, html FROM fragments WHERE key IN ({p})".format(
+                            p=placeholders
+                        ),
+                        chunk,
+                    )
+                )
+                self.connection.execute(
+                    "UPDATE fragments SET used = ? WHERE key IN ({p})".format(
+                        p=placeholders
+                    ),
+                    [self.build] + chunk,
+                )
+        return found
+
+    def add(self, fragments):
+        """Store a dict of {key: html}, as used by the current build."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fragments VALUES (?, ?, ?, ?)",
+                (
+                    (key, html, len(html.encode("utf-8")), self.build)
+                    for key, html in fragments.items()
+                ),
+            )
+
+    def size(self):
+        """The total size of the fragments in bytes."""
+        (size,) = self.connection.execute("SELECT SUM(size) FROM fragments").fetchone()
+        return size or 0
+
+    def evict(self):
+        """Remove the fragments used least recently until the store is within max_bytes. Returns the number of
+        fragments removed."""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return 0
+        removed = []
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM fragments ORDER BY used"
+        ):
+            if excess <= 0:
+                break
+            removed.append((key,))
+            excess -= size
+        with self.connection:
+            self.connection.executemany("DELETE FROM fragments WHERE key = ?", removed)
+        return len(removed)
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM fragments")
+
+
+def open_store(path=":memory:", max_bytes=50 * 1024 * 1024):
+    """Return the FragmentStore at path, opened once and then shared by every build (e.g. in watch mode). Each
+    process opens its own, as an SQLite connection can't be used by a forked process."""
+    return shared_store(path, max_bytes, os.getpid())
+
+
+@functools.lru_cache(maxsize=None)
+def shared_store(path, max_bytes, process_id):
+    return FragmentStore(path, max_bytes)
@@ -0,0 +1,68 @@
+# This file contains the index used to find words that are spelt almost the same, e.g. duplicate entries that differ
+# by one segment or a diacritic. Comparing every pair of words is far too slow for a whole lexicon, so each word is
+# indexed under every string left after deleting up to distance characters from it (a symmetric delete index). Two
+# words within distance edits of each other always share one of these strings, so only words that do are compared.
+import itertools
+import unicodedata
+
+
+def normalise(word):
+    """Lower case with accents split from their letters, so a missing diacritic counts as one edit."""
+    return unicodedata.normalize("NFD", str(word).lower())
+
+
+def deletions(word, distance):
+    """Return word and every string made by deleting up to distance characters from it."""
+    forms = {word}
+    for _ in range(distance):
+        forms |= {f[:i] + f[i + 1 :] for f in forms for i in range(len(f))}
+    return forms
+
+
+def edit_distance(a, b, limit=None):
+    """The Levenshtein distance between a and b. If limit is given the calculation stops once the distance is
+    known to be more than limit, returning limit + 1."""
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # a shared start and end don't change the distance, leaving little to compare for similar words
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start : len(a) - end], b[start : len(b) - end]
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def near_pairs(words, distance=1):
+    """Yield (i, j, d) for every pair of different words within distance edits of each other, where i < j are
+    their positions in words and d is the edit distance. Pairs are in order of i then j."""
+    buckets = {}
+    for i, word in enumerate(words):
+        for form in deletions(word, distance):
+            buckets.setdefault(form, []).append(i)
+
+    candidates = set()
+    for bucket in buckets.values():
+        candidates.update(itertools.combinations(bucket, 2))
+    for i, j in sorted(candidates):
+        if words[i] == words[j]:
+            continue
+        d = edit_distance(words[i], words[j], distance)
+        if d <= distance:
+            yield i, j, d
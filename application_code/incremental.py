@@ -0,0 +1,37 @@
+# This file contains what makes updates incremental. A FragmentStore (see fragments.py) keeps the HTML rendered
+# for each dictionary entry, keyed by a hash of the entry and the templates, and on the next build only entries
+# whose rows have changed are rendered again. Validation isn't cached: one pass over the rows (see
+# process_data.ValidationIndex) is quicker than working out which rows have changed.
+import os
+
+from markupsafe import Markup
+
+from application_code import cache
+
+
+def template_version(template_dir="templates"):
+    """A hash of every template, so rendered fragments are thrown away when a template is edited."""
+    files = []
+    for folder, _, names in sorted(os.walk(template_dir)):
+        for name in sorted(names):
+            path = os.path.join(folder, name)
+            files.append((os.path.relpath(path, template_dir), cache.hash_file(path)))
+    return cache.hash_value(files)
+
+
+def render_entries(template, lexicon_entries, store, version):
+    """Set entry.html to the rendered HTML of each LexiconEntry, reusing fragments in store (a FragmentStore) and
+    only rendering entries that aren't there. version is the template_version() of the templates, part of each
+    fragment's key so a template edit renders every entry again. Returns the number of entries rendered."""
+    store.new_build()
+    keys = [cache.hash_value((version, e.headword, e.entry)) for e in lexicon_entries]
+    fragments = store.get(set(keys))
+    new = {}
+    for entry, key in zip(lexicon_entries, keys):
+        html = fragments.get(key)
+        if html is None:
+            html = fragments[key] = new[key] = template.render(entry=entry)
+        entry.html = Markup(html)
+    store.add(new)
+    store.evict()
+    return len(new)
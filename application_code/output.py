@@ -2,19 +2,30 @@
 # third and final layer. HTML pages and Phonology assistant databases can be produced
 
 import datetime
+import functools
 import logging
 import os
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 try:
     import lexicon_config
 except ModuleNotFoundError:
     import example_lexicon_config as lexicon_config
+from application_code import fragments
+from application_code import incremental
+from application_code import parallel
 from application_code import process_data
+from application_code import search
+from application_code import wordforms
 
 logger = logging.getLogger("LexiconLog")
 
+# Folder in the cache folder where compiled templates are kept
+TEMPLATE_CACHE = "templates"
+# Folder in the target folder for the letters of a sharded dictionary page
+SHARD_FOLDER = "letters"
+
 
 def assert_templates_exist(template_dir="templates"):
     templates = [
@@ -23,8 +34,11 @@ def assert_templates_exist(template_dir="templates"):
     ]
     partial_templates = [
         "base.html",
+        "dictionary_entry.html",
         "entry.html",
         "header.html",
+        "letter_entries.html",
+        "letter_shard.js",
         "paradigm.html",
         "verb_entry.html",
     ]
@@ -44,20 +58,119 @@ def assert_templates_exist(template_dir="templates"):
         raise FileNotFoundError(msg)
 
 
-def generate_html(processed_data, verb_data=None):
-    """Generate the HTML pages"""
+def template_environment(template_dir="templates"):
+    """One Environment is shared by every page so each template is only compiled once, even across rebuilds in
+    watch mode. Edited templates are reloaded automatically. If a cache_folder is set compiled templates are kept
+    there too, so later runs load them rather than compiling every template again."""
+    cache_folder = lexicon_config.settings.get("cache_folder")
+    bytecode_folder = None
+    if cache_folder:
+        bytecode_folder = os.path.join(cache_folder, TEMPLATE_CACHE)
+    return shared_environment(template_dir, bytecode_folder)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_environment(template_dir, bytecode_folder):
+    bytecode_cache = None
+    if bytecode_folder:
+        os.makedirs(bytecode_folder, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_folder)
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+    )
+    env.policies["json.dumps_kwargs"] = {"ensure_ascii": False, "sort_keys": True}
+    return env
+
+
+def fragment_store():
+    """The store of rendered entries, kept in the cache folder (in memory if there isn't one) and limited to the
+    fragment_cache_size setting in MB. Shared by every build in watch mode."""
+    cache_folder = lexicon_config.settings.get("cache_folder")
+    path = ":memory:"
+    if cache_folder:
+        os.makedirs(cache_folder, exist_ok=True)
+        path = os.path.join(cache_folder, fragments.STORE_NAME)
+    max_mb = lexicon_config.settings.get("fragment_cache_size", 50)
+    return fragments.open_store(path, int(max_mb * 1024 * 1024))
+
+
+def precompile_templates(template_dir="templates"):
+    """Compile every template into the cache folder, e.g. after installing or updating, so the next run doesn't
+    have to. Returns the number of templates compiled."""
+    assert lexicon_config.settings.get(
+        "cache_folder"
+    ), "No cache_folder is set in lexicon_config.py"
+    env = template_environment(template_dir)
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def generate_html(processed_data, verb_data=None, refresh_cache=False):
+    """Generate the HTML pages. Rendered entries from earlier builds are reused for rows that haven't changed (see
+    fragment_store()), refresh_cache=True renders every entry again."""
     assert_templates_exist()
-    errors = process_data.validate_data(processed_data)
+    if refresh_cache:
+        fragment_store().clear()
+    timings = {}
+    errors = process_data.validate_data(processed_data, timings=timings)
+    timings = process_data.timing_report(timings, errors)
+    for name, seconds, count in timings:
+        logger.info(
+            "   -{n} found {c} errors in {s:.3f}s".format(n=name, c=count, s=seconds)
+        )
 
-    generate_lexicon_page(processed_data, errors, verb_data=verb_data)
-    logger.info("HTML pages sucessfully generated")
+    # the lexicon page is generated here, as the templates and rendered entries it uses are kept in this process
+    # for the next build in watch mode
+    lexicon_page = {
+        "Lexicon page": (
+            generate_lexicon_page,
+            {
+                "processed_data": processed_data,
+                "errors": errors,
+                "verb_data": verb_data,
+            },
+        )
+    }
+    _, page_timings, wall_time = parallel.run_jobs(
+        page_jobs(processed_data, errors, verb_data=verb_data, timings=timings),
+        processes=lexicon_config.settings.get("processes"),
+        local_jobs=lexicon_page,
+    )
+    for name, seconds in page_timings.items():
+        logger.info("   -{n} generated in {s:.2f}s".format(n=name, s=seconds))
+    logger.info(
+        "HTML pages sucessfully generated in {w:.2f}s, {s:.2f}s saved by generating in parallel".format(
+            w=wall_time, s=max(sum(page_timings.values()) - wall_time, 0)
+        )
+    )
     if errors:
-        generate_error_page(errors)
         logger.info("   - an error page has been generated")
 
 
+def page_jobs(processed_data, errors, verb_data=None, timings=None):
+    """The pages and files made by generate_html() alongside the lexicon page, as parallel.run_jobs() jobs,
+    {name: (function, kwargs)}. They don't depend on each other so new pages just need adding to the dict."""
+    jobs = {
+        "Word form index": (
+            generate_word_form_index,
+            {"processed_data": processed_data, "verb_data": verb_data},
+        ),
+    }
+    if errors:
+        jobs["Error page"] = (
+            generate_error_page,
+            {"errors": errors, "timings": timings},
+        )
+    return jobs
+
+
 def generate_lexicon_page(processed_data, errors, verb_data=None):
-    """Create suitable headwords for a dictionary and create a dictionary HTML page"""
+    """Create suitable headwords for a dictionary and create a dictionary HTML page, and the search index used to
+    filter it. Entries already in the fragment_store() are reused."""
     process_data.check_processed_data(processed_data, "generate_HTML()")
 
     # Create the HTML header and navbar
@@ -69,39 +182,91 @@ def generate_lexicon_page(processed_data, errors, verb_data=None):
     lexicon_entries = process_data.create_lexicon_entries(
         processed_data, verb_data=verb_data
     )
-    initial_letters = process_data.get_word_beginnings(lexicon_entries)
-    half_letters = len(initial_letters) / 2
+    sections = process_data.group_by_letter(lexicon_entries)
+    search.write_search_index(
+        search.build_search_index(sections), lexicon_config.settings["target_folder"]
+    )
 
-    file_loader = FileSystemLoader("templates")
-    env = Environment(loader=file_loader, autoescape=True)
+    env = template_environment()
+    rendered = incremental.render_entries(
+        env.get_template("partial/dictionary_entry.html"),
+        lexicon_entries,
+        fragment_store(),
+        incremental.template_version(),
+    )
+    logger.info(
+        "   -{r} of {n} entries rendered, the rest reused from the last build".format(
+            r=rendered, n=len(lexicon_entries)
+        )
+    )
+    sharded = lexicon_config.settings.get("sharded_pages", False)
+    if sharded:
+        generate_letter_shards(sections)
     template = env.get_template("dictionary_template.html")
 
     html = os.path.join(lexicon_config.settings["target_folder"], "main_dict.html")
-    with open(html, "w", encoding="utf-8") as file:
-        print(
-            template.render(
-                context=context,
-                entries=lexicon_entries,
-                errors=errors,
-                letters=initial_letters,
-                half_letters=half_letters,
-            ),
-            file=file,
-        )
+    write_page(
+        template,
+        html,
+        context=context,
+        entries=lexicon_entries,
+        errors=errors,
+        sections=sections,
+        sharded=sharded,
+    )
+
+
+def generate_letter_shards(sections):
+    """For a sharded dictionary page write the entries of each initial letter, rendered with their html and number
+    set, to letters/<number>.js in the target folder. The page loads each one when its letter is opened or
+    searched. Returns the number of files written."""
+    folder = os.path.join(lexicon_config.settings["target_folder"], SHARD_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    template = template_environment().get_template("partial/letter_shard.js")
+    names = set()
+    for number, (_, columns) in enumerate(sections):
+        name = "{n}.js".format(n=number)
+        write_page(template, os.path.join(folder, name), number=number, columns=columns)
+        names.add(name)
+    for name in set(os.listdir(folder)) - names:  # letters no longer in the lexicon
+        os.remove(os.path.join(folder, name))
+    return len(names)
+
 
+def generate_word_form_index(processed_data, verb_data=None):
+    """Write the index of every word form (see wordforms.py) to the target folder."""
+    word_forms = process_data.get_word_forms(processed_data, verb_data)
+    wordforms.write_index(
+        word_forms,
+        os.path.join(lexicon_config.settings["target_folder"], wordforms.INDEX_FILE),
+    )
+    logger.info("   -{n} word forms indexed".format(n=len(word_forms)))
 
-def generate_error_page(errors):
-    """Creates a page that shows all the validation errors discovered in the spreadsheet"""
 
-    file_loader = FileSystemLoader("templates")
-    env = Environment(loader=file_loader, autoescape=True)
-    template = env.get_template("error_template.html")
+def generate_error_page(errors, timings=None):
+    """Creates a page that shows all the validation errors discovered in the spreadsheet, and how long each
+    validator took if timings (from process_data.timing_report()) are given"""
+    template = template_environment().get_template("error_template.html")
 
     context = generate_context(title="Data errors", header="errors")
     html = os.path.join(lexicon_config.settings["target_folder"], "errors.html")
 
-    with open(html, "w", encoding="utf-8") as file:
-        print(template.render(context=context, errors=errors), file=file)
+    write_page(template, html, context=context, errors=errors, timings=timings)
+
+
+def write_page(template, path, **variables):
+    """Render template to the file at path a piece at a time, so the whole page is never held in memory. The page
+    is written alongside and renamed over path once complete, so nobody opens a half written page."""
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(template.generate(**variables))
+            file.write("\n")
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 
 def generate_context(title, header):
@@ -0,0 +1,94 @@
+# This file contains a helper for running independent jobs, such as reading each spreadsheet, on a pool of
+# processes. Reading and decoding spreadsheets is CPU bound so threads wouldn't help.
+import concurrent.futures
+import logging
+import os
+import time
+
+logger = logging.getLogger("LexiconLog")
+
+
+def timed_call(function, kwargs):
+    """Call function(**kwargs) and return the result and the time it took."""
+    start = time.perf_counter()
+    result = function(**kwargs)
+    return result, time.perf_counter() - start
+
+
+class RecordHandler(logging.Handler):
+    """Keeps the records logged in a worker process so they can be sent back to be logged by the main process.
+    Arguments and tracebacks may not pickle, so each record keeps its formatted message instead."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = record.exc_text = record.stack_info = None
+        self.records.append(record)
+
+
+def worker_call(function, kwargs, level):
+    """Run timed_call() in a worker process, returning (result, seconds, records) where records are the messages
+    the job logged to LexiconLog at level or above. Workers don't have the main process's handlers unless they
+    were forked, and forked copies would write to the same files, so they're swapped for a RecordHandler while
+    the job runs. If the job raises, the records are attached to the exception as log_records."""
+    handler = RecordHandler()
+    handlers, old_level, propagate = logger.handlers, logger.level, logger.propagate
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    try:
+        result, seconds = timed_call(function, kwargs)
+    except Exception as e:
+        e.log_records = handler.records
+        raise
+    finally:
+        logger.handlers, logger.propagate = handlers, propagate
+        logger.setLevel(old_level)
+    return result, seconds, handler.records
+
+
+def log_records(records):
+    """Log records sent back from a worker through the handlers set up in this process."""
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
+def run_jobs(jobs, processes=None, local_jobs=None):
+    """Run jobs, a dict of {name: (function, kwargs)}, on a process pool. Functions and their arguments must be
+    picklable, so use module level functions. Returns (results, timings, wall_time) where results and timings
+    are dicts keyed by job name. An exception raised by a job is raised again here.
+    local_jobs are run in this process while the pool runs the others, for jobs that use state this process
+    keeps between runs (e.g. caches in watch mode). processes limits the size of the pool, 1 runs all the jobs
+    one after the other in this process."""
+    start = time.perf_counter()
+    results = {}
+    timings = {}
+    local_jobs = local_jobs or {}
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(jobs))
+
+    if processes <= 1:
+        for name, (function, kwargs) in list(local_jobs.items()) + list(jobs.items()):
+            results[name], timings[name] = timed_call(function, kwargs)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+            level = logger.getEffectiveLevel()
+            futures = {
+                name: pool.submit(worker_call, function, kwargs, level)
+                for name, (function, kwargs) in jobs.items()
+            }
+            for name, (function, kwargs) in local_jobs.items():
+                results[name], timings[name] = timed_call(function, kwargs)
+            for name, future in futures.items():
+                try:
+                    results[name], timings[name], records = future.result()
+                except Exception as e:
+                    log_records(getattr(e, "log_records", []))
+                    raise
+                log_records(records)
+    return results, timings, time.perf_counter() - start
@@ -1,81 +1,215 @@
 # This file contains functions for the 2nd layer of the application - processing the data for output. This involves
 # validating the raw data to identify data entry mistakes and collating the data under headwords (so for instance.
 # all the different meanings of 'running' would go under a single dictionary entry rather than several.
-import csv
+import concurrent.futures
+import datetime
 import logging
+import time
+import unicodedata
 from collections import Counter
 
+try:
+    import lexicon_config
+except ModuleNotFoundError:
+    import example_lexicon_config as lexicon_config
+from application_code import collation
+from application_code import fuzzy
 from application_code import verbs
 from application_code import read_data
 
 logger = logging.getLogger("LexiconLog")
 
 
-def validate_data(processed_data):
+def validate_data(processed_data, timings=None):
     """Check the spreadsheet for incorrectly entered data". Returns None or an error tuple. A master function
-    to call all validation checks and perform an assertion that good data is provided."""
+    to call all validation checks and perform an assertion that good data is provided. If timings (a dict) is
+    given the time taken by each validator is added to it."""
     check_processed_data(processed_data, "validate_data()")
+    results = run_validators(
+        processed_data,
+        threads=lexicon_config.settings.get("validation_threads", 1),
+        timings=timings,
+    )
+    return merge_errors([results])
+
+
+class Validator:
+    """A registered validation check. fields are the row fields it reads, index is True if it needs the shared
+    ValidationIndex and whole_lexicon is True if it compares rows that aren't linked by ID or phonetics, so it
+    can't be run on a group of rows alone. optional checks only run if named in the extra_validators setting."""
+
+    def __init__(self, function, fields, index, whole_lexicon, optional):
+        self.function = function
+        self.name = function.__name__
+        self.fields = fields
+        self.index = index
+        self.whole_lexicon = whole_lexicon
+        self.optional = optional
 
-    errors = [
-        validate_find_missing_senses(processed_data),
-        validate_find_missing_pos(processed_data),
-        validate_translation_missing(processed_data),
-        validate_repeated_id(processed_data),
-        validate_missing_id(processed_data),
-        validate_words_unique(processed_data),
-        validate_entered_by(processed_data),
-        validate_sense_number_order(processed_data),
+    def __call__(self, processed_data, index=None):
+        if self.index:
+            return self.function(processed_data, index=index)
+        return self.function(processed_data)
+
+    def __repr__(self):
+        return "{name} validator".format(name=self.name)
+
+
+# every registered Validator by name
+VALIDATORS = {}
+# errors from the standard checks are shown in this order, then those from other validators in the order they
+# were registered
+ERROR_ORDER = [
+    "validate_find_missing_senses",
+    "validate_find_missing_pos",
+    "validate_translation_missing",
+    "validate_repeated_id",
+    "validate_missing_id",
+    "validate_words_unique",
+    "validate_entered_by",
+    "validate_sense_number_order",
+]
+
+
+def validator(*fields, index=False, whole_lexicon=False, optional=False):
+    """Decorator registering a function as a validation check. The function takes the list of rows (and the
+    ValidationIndex as index= if index is True) and returns a DataValidationError or None."""
+    unknown = set(fields) - set(read_data.LexiconRow.fields)
+    if unknown:
+        raise ValueError("Unknown fields {f}".format(f=sorted(unknown)))
+
+    def register(function):
+        VALIDATORS[function.__name__] = Validator(
+            function, fields, index, whole_lexicon, optional
+        )
+        return function
+
+    return register
+
+
+def enabled_validators(settings=None):
+    """Return the validators to run: every standard check not named in the skip_validators setting, plus the
+    optional checks named in extra_validators."""
+    settings = settings or lexicon_config.settings
+    extra = settings.get("extra_validators", [])
+    skip = settings.get("skip_validators", [])
+    for name in set(extra) | set(skip):
+        if name not in VALIDATORS:
+            logger.warning("   -Unknown validator {n} in settings".format(n=name))
+    return [
+        v
+        for v in VALIDATORS.values()
+        if (not v.optional or v.name in extra) and v.name not in skip
     ]
-    errors = [e for e in errors if e]
+
+
+def run_validators(processed_data, validators=None, threads=1, timings=None):
+    """Run validators (by default the enabled validators) on the data and return {name: error or None}. The rows
+    are indexed once if any validator needs it. The validators are independent, so with threads > 1 they run on a
+    thread pool. If timings (a dict) is given the time taken by each validator is added to it."""
+    if validators is None:
+        validators = enabled_validators()
+    index = None
+    if any(v.index for v in validators):
+        index = ValidationIndex(processed_data)
+
+    def run(v):
+        start = time.perf_counter()
+        result = v(processed_data, index=index)
+        return result, time.perf_counter() - start
+
+    if threads > 1 and len(validators) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+            outcomes = list(pool.map(run, validators))
+    else:
+        outcomes = [run(v) for v in validators]
+
+    results = {}
+    for v, (result, seconds) in zip(validators, outcomes):
+        if result:
+            result.validator = v.name
+        results[v.name] = result
+        if timings is not None:
+            timings[v.name] = timings.get(v.name, 0) + seconds
+    return results
+
+
+def merge_errors(results):
+    """Combine the results of run_validators() for separate groups of rows into one error per validator. Returns
+    None if nothing was found."""
+    errors = []
+    order = ERROR_ORDER + [name for name in VALIDATORS if name not in ERROR_ORDER]
+    for name in order:
+        found = [r[name] for r in results if r.get(name)]
+        if found:
+            error_data = [d for e in found for d in e.error_data]
+            error = DataValidationError(found[0].error_type, error_data)
+            error.validator = name
+            errors.append(error)
+            logger.info(
+                "   -Data validation found: {e}".format(e=found[0].error_type.lower())
+            )
     if not errors:
         errors = None
     return errors
 
 
+def timing_report(timings, errors):
+    """Return a list of (validator name, seconds, number of errors found), slowest first."""
+    counts = {e.validator: len(e.error_data) for e in errors or []}
+    return sorted(
+        ((name, seconds, counts.get(name, 0)) for name, seconds in timings.items()),
+        key=lambda t: t[1],
+        reverse=True,
+    )
+
+
 class DataValidationError:
     """A simple object describing and detailing validation errors"""
 
     def __init__(self, error_type, error_data):
         self.error_type = error_type
         self.error_data = error_data
+        # name of the validator that found it, set by run_validators()
+        self.validator = None
 
     def __repr__(self):
         return "{type} error object".format(type=self.error_type)
 
 
-def get_repeated_ids(processed_data):
-    ids = [
-        item["id"] for item in processed_data if item["id"] > 0
-    ]  # ignore id 0 as that indicates no ID entered by user
-    count = Counter(ids)
-    count = count.items()  # convert to list of tuples (id, number of times counted)
-    repeated_ids = [
-        item[0] for item in count if item[1] > 1
-    ]  # filter out single occurrences
-    return repeated_ids
+class ValidationIndex:
+    """The rows grouped by ID and by phonetics in a single pass, so validators can look up the rows sharing an ID
+    or word instead of searching the whole list. Groups and the rows in them are in spreadsheet order."""
+
+    def __init__(self, processed_data):
+        self.by_id = {}
+        self.by_phon = {}
+        for row in processed_data:
+            if row.id > 0:  # ignore id 0 as that indicates no ID entered by user
+                self.by_id.setdefault(row.id, []).append(row)
+            self.by_phon.setdefault(row.phon, []).append(row)
+
 
+def get_repeated_ids(processed_data, index=None):
+    index = index or ValidationIndex(processed_data)
+    return [id_ for id_, rows in index.by_id.items() if len(rows) > 1]
 
-def get_repeated_words(processed_data):
-    words = [item["phon"] for item in processed_data]
-    count = Counter(words)
-    count = (
-        count.items()
-    )  # convert to list of tuples (phonetics, number of times counted)
-    repeated_phonetics = [
-        item[0] for item in count if item[1] > 1
-    ]  # filter out single occurrences
-    return repeated_phonetics
 
+def get_repeated_words(processed_data, index=None):
+    index = index or ValidationIndex(processed_data)
+    return [phon for phon, rows in index.by_phon.items() if len(rows) > 1]
 
-def validate_find_missing_senses(processed_data):
+
+@validator("phon", "sense", index=True)
+def validate_find_missing_senses(processed_data, index=None):
     """Returns a list (or None if n/a) of phonetic entries that are the same but aren't marked as senses of
     each other. This may reveal data entry errors."""
-    repeated_phonetics = get_repeated_words(processed_data)
+    index = index or ValidationIndex(processed_data)
     repeated_senses = []
-    for i in repeated_phonetics:
-        rows = [r for r in processed_data if r["phon"] == i]
+    for i in get_repeated_words(processed_data, index):
+        rows = index.by_phon[i]
 
-        entry_sense_count = Counter([entry["sense"] for entry in rows])
+        entry_sense_count = Counter([entry.sense for entry in rows])
         entry_sense_count = entry_sense_count.items()
         repeated_sense = [item for item in entry_sense_count if item[1] > 1]
         if repeated_sense:
@@ -85,58 +219,57 @@ def validate_find_missing_senses(processed_data):
             repeated_senses.append(error_msg)
 
     if repeated_senses:
-        logger.info("   -Data validation found repeated senses")
         return DataValidationError("Sense number repeated", repeated_senses)
     else:
         return None
 
 
+@validator("phon", "pos")
 def validate_find_missing_pos(processed_data):
     """Checks the spreadsheet for blank POS cells"""
     blank_pos = [
-        "{w} is missing pos".format(w=row["phon"])
+        "{w} is missing pos".format(w=row.phon)
         for row in processed_data
-        if row["pos"] == ""
+        if row.pos == ""
     ]
     if blank_pos:
-        logger.info("   -Data validation found missing POS")
         return DataValidationError("Part of speech missing", blank_pos)
     else:
         return None
 
 
+@validator("id", "phon")
 def validate_missing_id(processed_data):
     """Check for data assinged an ID of 0. Indicates user forgot to put ID number"""
     blank_id = [
-        "{w} is missing an ID number".format(w=row["phon"])
+        "{w} is missing an ID number".format(w=row.phon)
         for row in processed_data
-        if row["id"] == 0
+        if row.id == 0
     ]
     if blank_id:
-        logger.info("   -Data validation found missing ID number")
         return DataValidationError("ID number is missing", blank_id)
     else:
         return None
 
 
-def validate_repeated_id(processed_data):
+@validator("id", "phon", index=True)
+def validate_repeated_id(processed_data, index=None):
     """ID numbers can be reused only if the phonetic word is the same. A repeated ID indicates a secondary sense of a
     a word. Thus repeated ID numbers with differing phonetics indicates a data entry mistake"""
-    repeated_ids = get_repeated_ids(processed_data)
+    index = index or ValidationIndex(processed_data)
     error_data = []
-    for i in repeated_ids:
-        rows = [r for r in processed_data if r["id"] == i]
-        entry = rows[0]["phon"]  # pick an word to measure all the others against
+    for i in get_repeated_ids(processed_data, index):
+        rows = index.by_id[i]
+        entry = rows[0].phon  # pick an word to measure all the others against
         for row in rows:
-            if entry != row["phon"]:
+            if entry != row.phon:
                 error_data.append(
                     "ID number {id} is used for both {entry} and {conflict}".format(
-                        id=i, entry=entry, conflict=row["phon"]
+                        id=i, entry=entry, conflict=row.phon
                     )
                 )
 
     if error_data:
-        logger.info("   -Data validation found repeated ids with differing phonetics")
         return DataValidationError(
             "An ID number has been incorrectly repeated", error_data
         )
@@ -144,16 +277,16 @@ def validate_repeated_id(processed_data):
         return None
 
 
+@validator("phon", "ex", "trans")
 def validate_translation_missing(processed_data):
     missing_translations = [
         '{w} example: "{ex}", is missing a translation'.format(
-            w=row["phon"], ex=row["ex"]
+            w=row.phon, ex=row.ex
         )
         for row in processed_data
-        if (row["ex"] != "" and row["trans"] == "")
+        if (row.ex != "" and row.trans == "")
     ]
     if missing_translations:
-        logger.info("   -Data validation found missing example translations")
         return DataValidationError(
             "Example is missing a translation", missing_translations
         )
@@ -161,50 +294,52 @@ def validate_translation_missing(processed_data):
         return None
 
 
-def validate_words_unique(processed_data):
+@validator("id", "phon", index=True)
+def validate_words_unique(processed_data, index=None):
     """Checks for words that are phonetically identical, but don't have identical IDs. If the word is a sense of another
     word the ID number should be the same."""
-    repeated_phonetics = get_repeated_words(processed_data)
+    index = index or ValidationIndex(processed_data)
     error_data = []
-    for i in repeated_phonetics:
-        rows = [r for r in processed_data if r["phon"] == i]
-        id_ = rows[0]["id"]  # pick an id to measure all the others against
+    for i in get_repeated_words(processed_data, index):
+        rows = index.by_phon[i]
+        id_ = rows[0].id  # pick an id to measure all the others against
         for row in rows:
-            if id_ != row["id"]:
+            if id_ != row.id:
                 error_data.append(
                     "{w} appears multiple times with differing ID number".format(
-                        w=row["phon"]
+                        w=row.phon
                     )
                 )
 
     if error_data:
-        logger.info("   -Data validation found repeated words")
         return DataValidationError("Word is duplicated", error_data)
     else:
         return None
 
 
+@validator("phon", "enter")
 def validate_entered_by(processed_data):
     """Finds words that have a blank entered_by field"""
     error_data = [
-        "{w} is lacking an author".format(w=r["phon"])
+        "{w} is lacking an author".format(w=r.phon)
         for r in processed_data
-        if r["enter"] == ""
+        if r.enter == ""
     ]
     if error_data:
-        logger.info("   -Data validation found repeated words")
         return DataValidationError("Author is missing", error_data)
     else:
         return None
 
 
-def validate_sense_number_order(processed_data):
+@validator("id", "phon", "sense", index=True)
+def validate_sense_number_order(processed_data, index=None):
     """Checks to make sure sense numbers aren't missing. 1,2,3 rather than 1,3,4 for example."""
-    repeated_ids = get_repeated_ids(processed_data)
+    index = index or ValidationIndex(processed_data)
     error_data = []
-    for id_ in repeated_ids:
-        phonetics = [r["phon"] for r in processed_data if r["id"] == id_][0]
-        sense_numbers = sorted([r["sense"] for r in processed_data if r["id"] == id_])
+    for id_ in get_repeated_ids(processed_data, index):
+        rows = index.by_id[id_]
+        phonetics = rows[0].phon
+        sense_numbers = sorted([r.sense for r in rows])
         error_msg = "{w} has sense numbers {s}".format(w=phonetics, s=sense_numbers)
 
         if sense_numbers[0] != 1:  # find sense numbers that don't start with 1
@@ -220,44 +355,122 @@ def validate_sense_number_order(processed_data):
                     error_data.append(error_msg)
                     continue
     if error_data:
-        logger.info("   -Data validation found misnumbered sense numbers")
         return DataValidationError("Sense numbers misnumbered", error_data)
     else:
         return None
 
 
+@validator("phon", optional=True)
+def validate_phonetic_characters(processed_data):
+    """Finds phonetics using characters outside the phonetic_characters setting"""
+    allowed = set(lexicon_config.settings.get("phonetic_characters", ""))
+    if not allowed:
+        return None
+    allowed.update(" -")
+    error_data = []
+    for r in processed_data:
+        not_allowed = sorted(set(r.phon) - allowed)
+        if not_allowed:
+            error_data.append(
+                "{w} contains {c}".format(w=r.phon, c=", ".join(not_allowed))
+            )
+    if error_data:
+        return DataValidationError("Phonetic character not allowed", error_data)
+    else:
+        return None
+
+
+@validator("orth", "phon", "syn", "ant", whole_lexicon=True, optional=True)
+def validate_links_both_ways(processed_data):
+    """Synonyms and antonyms should be listed on both words. Finds links (comma separated phonetics or
+    orthography) that don't point back, or point to a word that isn't in the lexicon."""
+    links = {}  # word: set of words it links to
+    for r in processed_data:
+        for name in {r.phon, r.orth} - {""}:
+            for field in ("syn", "ant"):
+                links.setdefault(name, set()).update(
+                    w.strip() for w in str(r[field]).split(",") if w.strip()
+                )
+
+    error_data = []
+    for r in processed_data:
+        names = {r.phon, r.orth} - {""}
+        for field, relation in (("syn", "a synonym"), ("ant", "an antonym")):
+            for word in str(r[field]).split(","):
+                word = word.strip()
+                if word and not names & links.get(word, set()):
+                    error_data.append(
+                        "{w} lists {l} as {r} but {l} doesn't link back".format(
+                            w=r.phon, l=word, r=relation
+                        )
+                    )
+    if error_data:
+        return DataValidationError("Link only goes one way", error_data)
+    else:
+        return None
+
+
+@validator("phon", "date", optional=True)
+def validate_date_format(processed_data):
+    """Finds dates that were typed as text rather than entered as a date"""
+    error_data = [
+        "{w} has date {d}, which isn't formatted as a date".format(w=r.phon, d=r.date)
+        for r in processed_data
+        if r.date != "" and not isinstance(r.date, datetime.date)
+    ]
+    if error_data:
+        return DataValidationError("Date in unusual format", error_data)
+    else:
+        return None
+
+
+@validator("id", "orth", "phon", "dial", whole_lexicon=True, optional=True)
+def validate_near_duplicates(processed_data):
+    """Finds words (phonetics, orthography or dialect variants) of different entries that are within the
+    near_duplicate_distance setting (default 1) edits of each other, which are often the same word entered twice.
+    Words shorter than 3 letters are ignored, as most short words are that close."""
+    distance = lexicon_config.settings.get("near_duplicate_distance", 1)
+    entries = {}  # normalised word: set of the entries it's used by
+    for i, r in enumerate(processed_data):
+        entry = r.id if r.id > 0 else ("row", i)  # rows without an ID are separate entries
+        for word in (r.phon, r.orth, r.dial):
+            word = fuzzy.normalise(word)
+            if len(word) >= 3:
+                entries.setdefault(word, set()).add(entry)
+
+    words = list(entries)
+    error_data = []
+    for i, j, d in fuzzy.near_pairs(words, distance):
+        if entries[words[i]].isdisjoint(entries[words[j]]):
+            error_data.append(
+                "{a} and {b} are {d} edit{s} apart".format(
+                    a=unicodedata.normalize("NFC", words[i]),
+                    b=unicodedata.normalize("NFC", words[j]),
+                    d=d,
+                    s="" if d == 1 else "s",
+                )
+            )
+    if error_data:
+        return DataValidationError("Possible duplicate word", error_data)
+    else:
+        return None
+
+
 def sort_by_id(processed_data):
-    return sorted(processed_data, key=lambda data: data["id"])
+    return sorted(processed_data, key=lambda data: data.id)
 
 
 def sort_by_tag(processed_data):
-    return sorted(processed_data, key=lambda data: data["tag"].lower())
+    return sorted(processed_data, key=lambda data: data.tag.lower())
 
 
 def sort_by_sense(processed_data):
-    return sorted(processed_data, key=lambda data: data["sense"])
-
-
-def phonetic_sort(character):
-    if character == "ɛ":
-        return "e"
-    elif character == "β":
-        return "b"
-    elif character == "ə":
-        return "e"
-    elif character == "ɑ":
-        return "a"
-    elif character == "ʔ":
-        return "k"
-    elif character == "ɔ":
-        return "o"
-    else:
-        return character
+    return sorted(processed_data, key=lambda data: data.sense)
 
 
 # Define some quick asserts to make sure functions are given the correct data model to work on (they are similar)
 def check_processed_data(processed_data, function):
-    """A quick assert that the right data model is given to function, a list of dictionaries produced by
+    """A quick assert that the right data model is given to function, a list of LexiconRow objects produced by
     read_lexicon()"""
     try:
         assert len(processed_data) > 0, "No data to work on!"
@@ -266,8 +479,8 @@ def check_processed_data(processed_data, function):
         ), "wrong data type given to {function} - needs the result of read_lexicon()".format(
             function=function
         )
-        assert (
-            type(processed_data[0]) == dict
+        assert isinstance(
+            processed_data[0], read_data.LexiconRow
         ), "wrong data type given to {function} - needs the result of read_lexicon()".format(
             function=function
         )
@@ -297,8 +510,8 @@ class LexiconEntry:
     def __init__(self, headword, entry):
         self.headword = headword
         try:
-            # must be either a dictionary or list of dictionaries
-            if type(entry) == dict:
+            # must be either a dictionary, a KovolVerb or list of dictionaries
+            if type(entry) == dict or isinstance(entry, verbs.KovolVerb):
                 self.entry = [entry]
             elif type(entry) == list:
                 if entry[0] != dict:
@@ -323,34 +536,37 @@ def create_lexicon_entries(processed_data, verb_data=None):
     """Takes the data and creates actual dictionary entries that takes account of multiple senses for the same word.
     Returns a list of tuples (headword, list of sense dictionary) sorted alphabetically by headword"""
     check_processed_data(processed_data, "create_lexicon_entries()")
-    processed_data = sort_by_sense(processed_data)  # get the sense numbers in order
-    processed_data = sort_by_id(processed_data)
+    # group rows by ID with the sense numbers in order, in a single sort
+    processed_data = sorted(
+        processed_data, key=lambda data: (data.id, data.sense)
+    )
     lexicon_entries = []
     last_id = 0  # blank variable to check if headwords are the same
     lexeme_index = -1  # counter for lexicon_entries
     # Loop through the entries and create the dictionary entries
     for entry in processed_data:
         # choose phonetics for headword if orthography not available
-        if entry["orth"]:
-            headword = entry["orth"]
+        if entry.orth:
+            headword = entry.orth
             orth_prediction = None
         else:
-            headword = entry["phon"]
+            headword = entry.phon
             # orth_prediction = phonemics.phonetics_to_orthography(entry["phon"], hard_fail=False)
 
         sense_data = {
-            "pos": entry["pos"],
-            "phonetics": entry["phon"],
-            "english": entry["eng"],
-            "tok_pisin": entry["tpi"],
-            "definition": entry["def"],
-            "example": entry["ex"],
-            "example_translation": entry["trans"],
-            "sense": entry["sense"],
+            "pos": entry.pos,
+            "phonetics": entry.phon,
+            "dialect": entry.dial,
+            "english": entry.eng,
+            "tok_pisin": entry.tpi,
+            "definition": entry.definition,
+            "example": entry.ex,
+            "example_translation": entry.trans,
+            "sense": entry.sense,
         }
 
         if (
-            last_id == entry["id"] and entry["id"] != 0
+            last_id == entry.id and entry.id != 0
         ):  # this is a sense of the previous headword
             # 0 is used to mark missing IDs
             lexicon_entries[lexeme_index].entry.append(sense_data)
@@ -359,36 +575,42 @@ def create_lexicon_entries(processed_data, verb_data=None):
             # lexeme.orth_prediction = orth_prediction
             lexicon_entries.append(lexeme)
             lexeme_index += 1
-        last_id = entry["id"]
+        last_id = entry.id
 
     if verb_data:
         lexicon_entries += create_verb_lexicon_entries(verb_data)
-    # sort alphabetically
-    lexicon_entries = sorted(
-        lexicon_entries,
-        key=lambda lexeme_object: phonetic_sort(lexeme_object.headword.lower()),
-    )
+    # sort alphabetically, working out each headword's sort and search keys once
+    collator = collation.get_collator()
+    for lexeme in lexicon_entries:
+        lexeme.sort_key = collator.sort_key(lexeme.headword)
+        lexeme.search_keys = list(
+            dict.fromkeys(collator.search_key(w) for w in kovol_forms(lexeme))
+        )
+    lexicon_entries = sorted(lexicon_entries, key=lambda lexeme: lexeme.sort_key)
     return lexicon_entries
 
 
-def create_verb_lexicon_entries(verb_data):
-    """Convert a list of verb objects into Lexeme objects."""
-    if "ID" in verb_data[0][0]:
-        verb_data.pop(0)  # Remove header
+def kovol_forms(lexeme):
+    """Return the Kovol words of a LexiconEntry: the headword, phonetics and dialect variants, or every form of a
+    verb."""
+    if isinstance(lexeme.entry[0], verbs.KovolVerb):
+        forms = (lexeme.headword,) + verbs.form_values(lexeme.entry[0])
+        return [f for f in forms if f]
+    forms = [lexeme.headword]
+    for sense in lexeme.entry:
+        forms += [sense["phonetics"], sense["dialect"]]
+    return [str(f) for f in forms if f]
 
-    verb_data = [
-        {"actor": v[1], "tense": v[2], "mode": v[3], "kov": v[4], "eng": v[5]}
-        for v in verb_data
-    ]
 
-    # Get a list of the unique verbs (identified by English translation)
-    eng = set([v["eng"] for v in verb_data])
-    # Get list of all data where each index is a list of dict items for each translation
-    verb_data = [[d for d in verb_data if d["eng"] == e] for e in eng]
+def create_verb_lexicon_entries(verb_data):
+    """Convert a list of verb objects into Lexeme objects."""
+    if "ID" in str(verb_data[0][0]):
+        verb_data = verb_data[1:]  # Remove header, leaving the caller's list alone
 
-    verb_data = verbs.csv_data_to_verb_object(verb_data)
+    # columns are ID, actor, tense, mode, kov, eng
+    verb_data = verbs.paradigm_rows_to_verbs(v[1:6] for v in verb_data)
 
-    lexicon_entries = [LexiconEntry(v.future_1s, v.__dict__) for v in verb_data]
+    lexicon_entries = [LexiconEntry(v.future_1s, v) for v in verb_data]
     # for l in lexicon_entries:
     #     l.orth_prediction = phonemics.phonetics_to_orthography(l.entry[0]["future_1s"], hard_fail=False)
     return lexicon_entries
@@ -399,14 +621,53 @@ def get_word_beginnings(lexicon_entries):
     headwords"""
     check_lexicon_entries(lexicon_entries, "get_word_beginnings()")
     letters = [x.headword[0].lower() for x in lexicon_entries if x.headword]
-    return sorted(set(letters), key=phonetic_sort)
-
-
-def get_verb_conjugations(checked=False):
-    """Retrieve only the Kovol words from the verb .csv"""
-    with open(
-        read_data.verb_sheet_to_csv(checked=checked), "r", encoding="utf-8"
-    ) as csvfile:
-        data = csv.reader(csvfile)
-        data = [{"phon": d[3]} for d in data]
-        return data
+    return sorted(set(letters), key=collation.get_collator().sort_key)
+
+
+def group_by_letter(lexicon_entries):
+    """Takes a list of LexiconEntry objects, sorted alphabetically, and returns a list of (letter, columns) in
+    alphabetical order of letter. columns is the entries starting with that letter split into two halves, one for
+    each column of the dictionary page. Entries are grouped in a single pass so the template only visits each
+    once."""
+    check_lexicon_entries(lexicon_entries, "group_by_letter()")
+    buckets = {}
+    for entry in lexicon_entries:
+        if entry.headword:
+            buckets.setdefault(entry.headword[0].lower(), []).append(entry)
+    sections = []
+    for letter in sorted(buckets, key=collation.get_collator().sort_key):
+        entries = buckets[letter]
+        half = (len(entries) + 1) // 2
+        sections.append((letter, (entries[:half], entries[half:])))
+    return sections
+
+
+def get_word_forms(processed_data, verb_data=None):
+    """Return every Kovol form in the lexicon (phonetics, orthography and dialect variants) and the verb paradigms
+    as (search key, form, headword ID, form name) tuples sorted by search key (see Collator.search_key()). The
+    form name is the KovolVerb attribute e.g. future_1s for verb forms and '' otherwise. IDs are text, as verb
+    sheet IDs needn't be numbers."""
+    collator = collation.get_collator()
+    forms = set()
+    for r in processed_data:
+        for word in (r.phon, r.orth, r.dial):
+            if word:
+                forms.add((collator.search_key(str(word)), str(word), str(r.id), ""))
+    if verb_data:
+        if "ID" in str(verb_data[0][0]):
+            verb_data = verb_data[1:]  # Remove header
+        # columns are ID, actor, tense, mode, kov, eng
+        for id_, actor, tense, mode, kov in (v[:5] for v in verb_data if len(v) > 4):
+            if kov == "":
+                continue
+            for slot in verbs.conjugation_slots(str(tense), str(actor), str(mode)):
+                forms.add((collator.search_key(str(kov)), str(kov), str(id_), slot))
+    return sorted(forms)
+
+
+def get_verb_conjugations(verb_data):
+    """Retrieve only the Kovol words from the verb paradigm rows returned by read_data.read_verbsheet()"""
+    if "ID" in str(verb_data[0][0]):
+        verb_data = verb_data[1:]  # Remove header
+    # columns are ID, actor, tense, mode, kov, eng
+    return [str(v[4]) for v in verb_data if len(v) > 4 and v[4] != ""]
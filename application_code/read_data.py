@@ -1,15 +1,18 @@
 # This file contains functions related to the first layer of the application: reading the spreadsheet
 # and returning the data in dictionary format, including some processing tasks that fill in blank cells
 import logging
+import operator
 import os
+from collections.abc import Mapping
 
 import pyexcel_io
-import pyexcel_ods3
 
 try:
     import lexicon_config
 except ModuleNotFoundError:
     import example_lexicon_config as lexicon_config
+from application_code import cache
+from application_code import spreadsheets
 
 logger = logging.getLogger("LexiconLog")
 
@@ -53,9 +56,12 @@ def letter_to_number(letter):
     return ord(letter.upper()) - 65
 
 
-def read_lexicon(*args, config_file=lexicon_config, number_of_columns=18):
+def read_lexicon(
+    *args, config_file=lexicon_config, number_of_columns=18, refresh_cache=False
+):
     """Reads the .ods and returns a list of dictionary items representing the lexicon,
-    unlike create_lexicon_entries() it doesn't group senses under 1 headword - it's just a data dump."""
+    unlike create_lexicon_entries() it doesn't group senses under 1 headword - it's just a data dump.
+    If a cache_folder is set the result is cached, refresh_cache=True ignores any existing snapshot."""
     if args:
         logger.info(
             "Function not designed to accept arguments. \nDefine the settings in lexicon_config.py or pass a "
@@ -66,24 +72,70 @@ def read_lexicon(*args, config_file=lexicon_config, number_of_columns=18):
     )  # pass this in for testing purposes
 
     spreadsheet = config_file.settings["spreadsheet_name"]
-    # read the file with pyexcel
-    try:
-        raw_data = pyexcel_ods3.get_data(spreadsheet)[
-            config_file.settings["sheet_name"]
-        ]
-        # Convert column letters to list integers
-        col = {
-            k: letter_to_number(v) for k, v in config_file.spreadsheet_config.items()
-        }
-        assert (
-            len(col) == number_of_columns
-        ), "{n} items expected in spreadsheet_config, {m} defined".format(
-            n=number_of_columns, m=len(col)
+    col = get_columns(config_file, number_of_columns)
+
+    # use the snapshot from a previous run if the spreadsheet hasn't changed
+    cache_folder = config_file.settings.get("cache_folder")
+    cache_key = (config_file.settings["sheet_name"], sorted(col.items()))
+    if cache_folder and not refresh_cache:
+        processed_data = cache.load_snapshot(
+            cache_folder, spreadsheet, "lexicon", cache_key
         )
+        if processed_data is not None:
+            logger.info(
+                "   -%d dictionary entries read from cache" % len(processed_data)
+            )
+            return processed_data
+
+    processed_data = list(
+        stream_lexicon(config_file=config_file, number_of_columns=number_of_columns)
+    )
+    processed_data.sort(key=lambda r: r.id)  # sort by ID number
+
+    if cache_folder:
+        cache.store_snapshot(
+            cache_folder, spreadsheet, "lexicon", cache_key, processed_data
+        )
+    logger.info("   -%d dictionary entries read" % len(processed_data))
+    return processed_data
+
+
+def stream_lexicon(config_file=lexicon_config, number_of_columns=18):
+    """Yields the lexicon one row at a time in spreadsheet order, passing each row through the same pre processing,
+    dict conversion and post processing as read_lexicon(). Only one row needs to be held in memory at a time."""
+    check_settings(config_file=config_file.settings)
+    spreadsheet = config_file.settings["spreadsheet_name"]
+    col = get_columns(config_file, number_of_columns)
+
+    rows = read_sheet_rows(
+        spreadsheet,
+        config_file.settings["sheet_name"],
+        col,
+        ods_reader=config_file.settings.get("ods_reader", "pyexcel"),
+    )
+    rows = pre_process_rows(rows, col)
+    rows = rows_to_records(rows, col, number_of_columns)
+    yield from post_process_rows(rows)
+
+
+def get_columns(config_file, number_of_columns):
+    """Convert the column letters in spreadsheet_config to list indexes."""
+    col = {k: letter_to_number(v) for k, v in config_file.spreadsheet_config.items()}
+    assert (
+        len(col) == number_of_columns
+    ), "{n} items expected in spreadsheet_config, {m} defined".format(
+        n=number_of_columns, m=len(col)
+    )
+    return col
+
+
+def read_sheet_rows(spreadsheet, sheet_name, col, ods_reader="pyexcel"):
+    """Yields the rows of the lexicon sheet, leaving out the header and blank rows."""
+    rows = spreadsheets.read_sheet(spreadsheet, sheet_name, ods_reader=ods_reader)
+    try:
+        first_row = next(rows)
         # pop the header if it exists
-        if type(raw_data[0][col["id_col"]]) == str:  # Str == 'ID'
-            raw_data.pop(0)
-        raw_data = [x for x in raw_data if x != []]  # get rid of blank rows
+        header = type(first_row[col["id_col"]]) == str  # Str == 'ID'
     except KeyError:
         msg = "{sheet} is not a valid sheet name.".format(sheet=spreadsheet)
         logger.exception(msg)
@@ -97,93 +149,218 @@ def read_lexicon(*args, config_file=lexicon_config, number_of_columns=18):
         )
         logger.exception(msg)
         raise TypeError(msg)
-    except IndexError:
+    except (StopIteration, IndexError):
         msg = "The file is blank"
         logger.exception(msg)
         raise AttributeError(msg)
 
-    # pre process
-    raw_data = pre_process_raw_data(raw_data, col)
-    # format as a list of dict
-    dict_data = raw_data_to_dict(raw_data, col, number_of_columns)
-    # post process
-    processed_data = post_process_raw_data(dict_data)
-
-    logger.info("   -%d dictionary entries read" % len(processed_data))
-    return processed_data
+    if not header:
+        yield first_row
+    for row in rows:
+        if row != []:  # get rid of blank rows
+            yield row
 
 
 def pre_process_raw_data(raw_data, col):
     """Exclude blank data and incorrect ID numbers each row from .ods dump."""
-    # set the id number to 0 if it's blank - preventing sort failures later
-    for row in raw_data:
-        if row[col["id_col"]] == "":
-            row[col["id_col"]] = 0
-    # exclude rows lacking ids and language data
-    raw_data = [
-        r
-        for r in raw_data
-        if r[col["id_col"]] or r[col["orth_col"]] or r[col["phon_col"]]
-    ]
+    raw_data = list(pre_process_rows(raw_data, col))
     raw_data.sort(key=lambda r: r[col["id_col"]])  # sort by ID number
     return raw_data
 
 
+def pre_process_rows(rows, col):
+    """Generator version of pre_process_raw_data(), the rows are left in their original order."""
+    for row in rows:
+        # set the id number to 0 if it's blank - preventing sort failures later
+        if row[col["id_col"]] == "":
+            row[col["id_col"]] = 0
+        # exclude rows lacking ids and language data
+        if row[col["id_col"]] or row[col["orth_col"]] or row[col["phon_col"]]:
+            yield row
+
+
+class LexiconRow(Mapping):
+    """A single row of the lexicon. Values are attributes (row.phon) stored in __slots__ to keep the memory used
+    per row small, but the row can still be used like the dictionary it replaced (row["phon"]), so templates and
+    code expecting a dict keep working. The definition is stored as row.definition and read as row["def"]."""
+
+    fields = (
+        "id",  # int, blank = 0 Don't force int, pre processing cleans up
+        "orth",  # str, blank = ''
+        "phon",  # str, blank = ''
+        "dial",  # str, blank = ''
+        "sense",  # int, blank = 1 Don't force int, pre processing cleans up
+        "pos",  # str, blank = ''
+        "eng",  # str, blank = ''
+        "tpi",  # str, blank = ''
+        "def",  # str, blank = ''
+        "ex",  # str, blank = ''
+        "trans",  # str, blank = ''
+        "date",  # datetime.date, blank = '', format enforced by spreadsheet
+        "enter",  # str, blank = ''
+        "check",  # str, blank = ''
+        "syn",  # str, blank = ''
+        "ant",  # str, blank = ''
+        "link",  # str, blank = ''
+        "tag",  # str, blank = ''
+    )
+    __slots__ = tuple(k if k != "def" else "definition" for k in fields)
+    attributes = dict(zip(fields, __slots__))
+
+    def __init__(
+        self,
+        id=0,
+        orth="",
+        phon="",
+        dial="",
+        sense=1,
+        pos="",
+        eng="",
+        tpi="",
+        definition="",
+        ex="",
+        trans="",
+        date="",
+        enter="",
+        check="",
+        syn="",
+        ant="",
+        link="",
+        tag="",
+    ):
+        self.id = id
+        self.orth = orth
+        self.phon = phon
+        self.dial = dial
+        self.sense = sense
+        self.pos = pos
+        self.eng = eng
+        self.tpi = tpi
+        self.definition = definition
+        self.ex = ex
+        self.trans = trans
+        self.date = date
+        self.enter = enter
+        self.check = check
+        self.syn = syn
+        self.ant = ant
+        self.link = link
+        self.tag = tag
+
+    @classmethod
+    def from_dict(cls, d):
+        """Create a row from a dictionary using the old key names."""
+        return cls(*(d[k] for k in cls.fields))
+
+    def __getitem__(self, key):
+        return getattr(self, self.attributes[key])
+
+    def __setitem__(self, key, value):
+        setattr(self, self.attributes[key], value)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        return "LexiconRow({d})".format(d=dict(self))
+
+
 def raw_data_to_dict(raw_data, col, number_of_columns):
-    """Take the rows from pyexcel_ods and convert from list to dict for easier handling."""
-    dict_data = []
-    for entry in raw_data:
-        while len(entry) < number_of_columns:  # add blank columns to avoid index errors
-            entry.append("")
-        d = {
-            "id": entry[
-                col["id_col"]
-            ],  # int, blank = 0 Don't force int, pre processing cleans up
-            "orth": str(entry[col["orth_col"]]),  # str, blank = ''
-            "phon": str(entry[col["phon_col"]]),  # str, blank = ''
-            "dial": str(entry[col["dial_col"]]),  # str, blank = ''
-            "sense": entry[
-                col["sense_col"]
-            ],  # int, blank = 1 Don't force int, pre processing cleans up
-            "pos": str(entry[col["pos_col"]]),  # str, blank = ''
-            "eng": str(entry[col["eng_col"]]),  # str, blank = ''
-            "tpi": str(entry[col["tpi_col"]]),  # str, blank = ''
-            "def": str(entry[col["def_col"]]),  # str, blank = ''
-            "ex": str(entry[col["ex_col"]]),  # str, blank = ''
-            "trans": str(entry[col["trans_col"]]),  # str, blank = ''
-            "date": entry[
-                col["date_col"]
-            ],  # datetime.date, blank = '', format enforced by spreadsheet
-            "enter": str(entry[col["enter_col"]]),  # str, blank = ''
-            "check": str(entry[col["check_col"]]),  # str, blank = ''
-            "syn": str(entry[col["syn_col"]]),  # str, blank = ''
-            "ant": str(entry[col["ant_col"]]),  # str, blank = ''
-            "link": str(entry[col["link_col"]]),  # str, blank = ''
-            "tag": str(entry[col["tag_col"]]),  # str, blank = ''
-        }
-
-        dict_data.append(d)
-    return dict_data
+    """Take the rows from pyexcel_ods and convert from list to LexiconRow (which also acts as a dict) for easier
+    handling."""
+    return list(rows_to_records(raw_data, col, number_of_columns))
+
+
+def rows_to_records(rows, col, number_of_columns):
+    """Generator version of raw_data_to_dict()."""
+    # pull every cell out of the row in one call, short rows are padded once rather than cell by cell
+    get_cells = operator.itemgetter(*(col[k + "_col"] for k in LexiconRow.fields))
+    width = max(number_of_columns, max(col.values()) + 1)
+    for entry in rows:
+        if len(entry) < width:  # add blank columns to avoid index errors
+            entry = entry + [""] * (width - len(entry))
+        (
+            id_,
+            orth,
+            phon,
+            dial,
+            sense,
+            pos,
+            eng,
+            tpi,
+            definition,
+            ex,
+            trans,
+            date,
+            enter,
+            check,
+            syn,
+            ant,
+            link,
+            tag,
+        ) = get_cells(entry)
+        yield LexiconRow(
+            id_,
+            str(orth),
+            str(phon),
+            str(dial),
+            sense,
+            str(pos),
+            str(eng),
+            str(tpi),
+            str(definition),
+            str(ex),
+            str(trans),
+            date,
+            str(enter),
+            str(check),
+            str(syn),
+            str(ant),
+            str(link),
+            str(tag),
+        )
 
 
 def post_process_raw_data(dict_data):
     """Add a default sense number to blank rows."""
-    # post processing tasks
-    for entry in dict_data:
-        if entry["sense"] == "":
-            entry["sense"] = 1
-    return dict_data
+    return list(post_process_rows(dict_data))
+
+
+def post_process_rows(rows):
+    """Generator version of post_process_raw_data()."""
+    for entry in rows:
+        if entry.sense == "":
+            entry.sense = 1
+        yield entry
 
 
 def read_verbsheet(
     spreadsheet=lexicon_config.settings["verb_spreadsheet"],
+    cache_folder=lexicon_config.settings.get("cache_folder"),
+    refresh_cache=False,
+    ods_reader=lexicon_config.settings.get("ods_reader", "pyexcel"),
 ):
     """Read the verb spreadsheet and return data"""
 
     # Returns an alphabetically sorted list of Verb objects
     assert os.path.exists(spreadsheet), "Verb spreadsheet missing"
-    raw_data = pyexcel_ods3.get_data(spreadsheet)["Paradigms"]
+    if cache_folder and not refresh_cache:
+        raw_data = cache.load_snapshot(cache_folder, spreadsheet, "verbs", "Paradigms")
+        if raw_data is not None:
+            return raw_data
+
     # get rid rows lacking data an English translation
-    raw_data = [x for x in raw_data if len(x) >= 6]
+    raw_data = [
+        x
+        for x in spreadsheets.read_sheet(
+            spreadsheet, "Paradigms", ods_reader=ods_reader
+        )
+        if len(x) >= 6
+    ]
 
+    if cache_folder:
+        cache.store_snapshot(cache_folder, spreadsheet, "verbs", "Paradigms", raw_data)
     return raw_data
@@ -0,0 +1,94 @@
+# This file contains the search index used by the filter on the dictionary page. Rather than the browser reading
+# the text of every entry on each keystroke, the index lists which entries contain each 3 letter sequence
+# (trigram) of each searchable field. It is built when the pages are generated and written next to them as a
+# JavaScript file, which unlike a .json file can be loaded by a page opened straight from disk.
+import json
+import os
+
+from application_code import collation
+from application_code import verbs
+
+GRAM_LENGTH = 3
+INDEX_FILE = "search_index.js"
+# The filter's radio buttons, each searches one field
+SEARCH_FIELDS = ("kovol", "english", "tok_pisin")
+SEPARATOR = "\n"  # joins the values of a field, as it can't be typed in the search box
+
+
+def entry_fields(entry):
+    """Return {field: [values]} for the searchable text of a LexiconEntry. 'kovol' is the entry's folded search
+    keys (see process_data.kovol_forms()), so searches match without typing phonetic characters."""
+    first = entry.entry[0]
+    if isinstance(first, verbs.KovolVerb):
+        return {
+            "kovol": entry.search_keys,
+            "english": [first.english],
+            "tok_pisin": [first.tpi],
+        }
+    return {
+        "kovol": entry.search_keys,
+        "english": [s["english"] for s in entry.entry],
+        "tok_pisin": [s["tok_pisin"] for s in entry.entry],
+    }
+
+
+def field_text(values):
+    """The lower case text of a field that a search is matched against."""
+    values = dict.fromkeys(str(v).lower() for v in values if v != "")  # drop repeats
+    return SEPARATOR.join(values)
+
+
+def grams(text):
+    """The set of trigrams in text, ignoring those that span two values."""
+    return {
+        text[i : i + GRAM_LENGTH]
+        for i in range(len(text) - GRAM_LENGTH + 1)
+        if SEPARATOR not in text[i : i + GRAM_LENGTH]
+    }
+
+
+def build_search_index(sections, collator=None):
+    """Build the search index for the sections returned by process_data.group_by_letter(). Every entry is given
+    a number (entry.number) in page order, used as its id on the page and in the index. For each field the index
+    holds the text of every entry and a map of trigram to the numbers of the entries containing it. letters
+    holds the section of each entry, so the page can hide letters without any matches. fold holds the character
+    equivalences the page uses to fold a Kovol search the same way as the search keys."""
+    collator = collator or collation.get_collator()
+    index = {
+        "fold": {chr(c): letters for c, letters in collator.fold_table.items()},
+        "letters": [],
+        "fields": {field: {"texts": [], "grams": {}} for field in SEARCH_FIELDS},
+    }
+    number = 0
+    for section, (_, columns) in enumerate(sections):
+        for column in columns:
+            for entry in column:
+                entry.number = number
+                index["letters"].append(section)
+                for field, values in entry_fields(entry).items():
+                    text = field_text(values)
+                    field_index = index["fields"][field]
+                    field_index["texts"].append(text)
+                    for gram in grams(text):
+                        field_index["grams"].setdefault(gram, []).append(number)
+                number += 1
+    return index
+
+
+def write_search_index(index, folder):
+    """Write the index to search_index.js in folder, as compact JSON assigned to the variable search_index. Like
+    the pages (see output.write_page()) it's written alongside and renamed once complete, so a page is never
+    opened with half an index."""
+    path = os.path.join(folder, INDEX_FILE)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write("var search_index = ")
+            json.dump(index, file, ensure_ascii=False, separators=(",", ":"))
+            file.write(";\n")
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
@@ -0,0 +1,269 @@
+# This file contains readers that stream rows straight out of spreadsheet files. They return the same cell values
+# as pyexcel (ints, floats, dates and strings) but only ever hold one row in memory and skip the sheets that
+# aren't wanted instead of building an object model of the whole workbook.
+import datetime
+import os
+import re
+import zipfile
+
+import openpyxl
+import pyexcel_io
+import xlrd
+from lxml import etree
+
+OFFICE_NS = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+
+TABLE = "{%s}table" % TABLE_NS
+TABLE_NAME = "{%s}name" % TABLE_NS
+ROW = "{%s}table-row" % TABLE_NS
+CELL = "{%s}table-cell" % TABLE_NS
+COVERED_CELL = "{%s}covered-table-cell" % TABLE_NS
+ROWS_REPEATED = "{%s}number-rows-repeated" % TABLE_NS
+COLUMNS_REPEATED = "{%s}number-columns-repeated" % TABLE_NS
+VALUE_TYPE = "{%s}value-type" % OFFICE_NS
+VALUE = "{%s}value" % OFFICE_NS
+DATE_VALUE = "{%s}date-value" % OFFICE_NS
+TIME_VALUE = "{%s}time-value" % OFFICE_NS
+BOOLEAN_VALUE = "{%s}boolean-value" % OFFICE_NS
+CURRENCY = "{%s}currency" % OFFICE_NS
+ANNOTATION = "{%s}annotation" % OFFICE_NS
+PARAGRAPH = "{%s}p" % TEXT_NS
+SPACES = "{%s}s" % TEXT_NS
+SPACES_COUNT = "{%s}c" % TEXT_NS
+TAB = "{%s}tab" % TEXT_NS
+LINE_BREAK = "{%s}line-break" % TEXT_NS
+
+
+def read_sheet(spreadsheet, sheet_name, ods_reader="pyexcel"):
+    """Yields each row of a sheet as a list of cell values, choosing a reader by file extension. .xlsx and .xls
+    files are always streamed, .ods files are streamed if ods_reader is 'lxml'. Anything else is passed to pyexcel.
+    Raises KeyError if the sheet doesn't exist."""
+    _, extension = os.path.splitext(spreadsheet)
+    extension = extension.lower()
+    if extension == ".ods" and ods_reader == "lxml":
+        return read_ods_sheet(spreadsheet, sheet_name)
+    elif extension == ".xlsx":
+        return read_xlsx_sheet(spreadsheet, sheet_name)
+    elif extension == ".xls":
+        return read_xls_sheet(spreadsheet, sheet_name)
+    return read_pyexcel_sheet(spreadsheet, sheet_name)
+
+
+def read_pyexcel_sheet(spreadsheet, sheet_name):
+    """Yields the rows of a sheet using whichever pyexcel plugin supports the file."""
+    try:
+        sheets, reader = pyexcel_io.iget_data(spreadsheet, sheet_name=sheet_name)
+    except ValueError:
+        raise KeyError(sheet_name)
+    try:
+        yield from sheets[sheet_name]
+    finally:
+        reader.close()
+
+
+def read_ods_sheet(spreadsheet, sheet_name):
+    """Yields the rows of one sheet of an .ods file as lists of cell values. content.xml is streamed out of the
+    zip with lxml's iterparse, repeated rows and cells are only expanded when followed by data and trailing empty
+    cells are dropped (as pyexcel does). Raises KeyError if the sheet doesn't exist."""
+    with zipfile.ZipFile(spreadsheet) as ods, ods.open("content.xml") as content:
+        in_sheet = False
+        found = False
+        blank_rows = 0  # repeated blank rows waiting to see if any data follows them
+        for event, element in etree.iterparse(
+            content, events=("start", "end"), tag=(TABLE, ROW)
+        ):
+            if element.tag == TABLE:
+                if event == "start":
+                    in_sheet = element.get(TABLE_NAME) == sheet_name
+                    found = found or in_sheet
+                elif in_sheet:
+                    break  # the rest of the document isn't needed
+                else:
+                    element.clear()
+                continue
+            if event == "end":
+                if in_sheet:
+                    row = ods_row_values(element)
+                    repeat = int(element.get(ROWS_REPEATED, 1))
+                    if row:
+                        for _ in range(blank_rows):
+                            yield []
+                        blank_rows = 0
+                        for _ in range(repeat - 1):
+                            yield list(row)
+                        yield row
+                    else:
+                        blank_rows += repeat
+                # free the parsed row so memory use doesn't grow with the sheet
+                element.clear()
+                parent = element.getparent()
+                while element.getprevious() is not None:
+                    del parent[0]
+    if not found:
+        raise KeyError(sheet_name)
+
+
+def ods_row_values(row):
+    """Return the values of a table-row element with trailing empty cells removed."""
+    values = []
+    blank_cells = 0  # repeated blank cells waiting to see if any data follows them
+    for cell in row:
+        if cell.tag != CELL and cell.tag != COVERED_CELL:
+            continue
+        repeat = int(cell.get(COLUMNS_REPEATED, 1))
+        value = ods_cell_value(cell)
+        if value == "":
+            blank_cells += repeat
+        else:
+            if blank_cells:
+                values.extend([""] * blank_cells)
+                blank_cells = 0
+            values.extend([value] * repeat)
+    return values
+
+
+def ods_cell_value(cell):
+    """Convert a table-cell element to a Python value the same way pyexcel-ods3 does."""
+    value_type = cell.get(VALUE_TYPE)
+    if value_type == "float":
+        value = float(cell.get(VALUE))
+        return int(value) if value.is_integer() else value
+    elif value_type == "string":
+        return "\n".join(paragraph_text(p) for p in cell if p.tag == PARAGRAPH)
+    elif value_type == "date":
+        return ods_date_value(cell.get(DATE_VALUE))
+    elif value_type == "percentage":
+        return float(cell.get(VALUE))
+    elif value_type == "currency":
+        value = float(cell.get(VALUE))
+        if value.is_integer():
+            value = int(value)
+        return "{v} {c}".format(v=value, c=cell.get(CURRENCY))
+    elif value_type == "boolean":
+        return cell.get(BOOLEAN_VALUE) == "true"
+    elif value_type == "time":
+        return ods_time_value(cell.get(TIME_VALUE))
+    return ""
+
+
+def paragraph_text(element):
+    """Return the plain text of a text:p element, expanding encoded spaces, tabs and line breaks."""
+    text = [element.text or ""]
+    for child in element:
+        if child.tag == SPACES:
+            text.append(" " * int(child.get(SPACES_COUNT, 1)))
+        elif child.tag == TAB:
+            text.append("\t")
+        elif child.tag == LINE_BREAK:
+            text.append("\n")
+        elif child.tag != ANNOTATION:
+            text.append(paragraph_text(child))  # spans, links etc.
+        text.append(child.tail or "")
+    return "".join(text)
+
+
+def ods_date_value(value):
+    """Dates without a time become datetime.date, otherwise datetime.datetime."""
+    try:
+        if len(value) == 10:
+            return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+        elif len(value) == 19:
+            return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+        elif len(value) > 19:
+            return datetime.datetime.strptime(value[0:26], "%Y-%m-%dT%H:%M:%S.%f")
+    except ValueError:
+        pass
+    return value
+
+
+def ods_time_value(value):
+    """Times are stored as durations e.g. PT10H30M00S."""
+    results = re.match(r"PT(\d+)H(\d+)M(\d+)S", value or "")
+    if not results:
+        return value
+    hour, minute, second = (int(g) for g in results.groups())
+    if hour < 24:
+        return datetime.time(hour, minute, second)
+    return datetime.timedelta(hours=hour, minutes=minute, seconds=second)
+
+
+def read_xlsx_sheet(spreadsheet, sheet_name):
+    """Yields the rows of one sheet of an .xlsx file. openpyxl's read only mode streams the sheet's xml rather than
+    loading the workbook. Values are converted to match the other readers."""
+    workbook = openpyxl.load_workbook(spreadsheet, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        yield from trimmed_rows([excel_value(v) for v in row] for row in rows)
+    finally:
+        workbook.close()
+
+
+def excel_value(value):
+    """Convert a value read by openpyxl to the type the other readers give."""
+    if value is None:
+        return ""
+    elif isinstance(value, float) and value.is_integer():
+        return int(value)
+    elif isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        return value.date()
+    return value
+
+
+def read_xls_sheet(spreadsheet, sheet_name):
+    """Yields the rows of one sheet of an .xls file. xlrd's on demand mode only loads the sheet that is asked
+    for. Values are converted the same way pyexcel-xls does."""
+    book = xlrd.open_workbook(spreadsheet, on_demand=True)
+    try:
+        try:
+            sheet = book.sheet_by_name(sheet_name)
+        except xlrd.XLRDError:
+            raise KeyError(sheet_name)
+        rows = (
+            [
+                xls_value(cell_type, value, book.datemode)
+                for cell_type, value in zip(sheet.row_types(i), sheet.row_values(i))
+            ]
+            for i in range(sheet.nrows)
+        )
+        yield from trimmed_rows(rows)
+    finally:
+        book.release_resources()
+
+
+def xls_value(cell_type, value, date_mode):
+    """Convert an xlrd cell value: whole numbers to int and dates to datetime objects."""
+    if cell_type == xlrd.XL_CELL_NUMBER:
+        return int(value) if value.is_integer() else value
+    elif cell_type == xlrd.XL_CELL_DATE:
+        date_tuple = xlrd.xldate_as_tuple(value, date_mode)
+        if date_tuple == (0, 0, 0, 0, 0, 0):
+            return datetime.datetime(1900, 1, 1, 0, 0, 0)
+        elif date_tuple[0:3] == (0, 0, 0):
+            return datetime.time(*date_tuple[3:6])
+        elif date_tuple[3:6] == (0, 0, 0):
+            return datetime.date(*date_tuple[0:3])
+        return datetime.datetime(*date_tuple)
+    elif cell_type == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    elif cell_type == xlrd.XL_CELL_ERROR:
+        return "#N/A"
+    return value
+
+
+def trimmed_rows(rows):
+    """Drop trailing empty cells from each row. Blank rows are only yielded (as []) when data follows them."""
+    blank_rows = 0
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        if not end:
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            yield []
+        blank_rows = 0
+        yield row[:end]
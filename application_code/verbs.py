@@ -2,11 +2,41 @@
 # Also handles verb prediction.
 
 import csv
+import functools
+import operator
+
+# Every conjugated form of a verb, in the order they're compared and hashed
+FORMS = (
+    "remote_past_1s",
+    "remote_past_2s",
+    "remote_past_3s",
+    "remote_past_1p",
+    "remote_past_2p",
+    "remote_past_3p",
+    "recent_past_1s",
+    "recent_past_2s",
+    "recent_past_3s",
+    "recent_past_1p",
+    "recent_past_2p",
+    "recent_past_3p",
+    "future_1s",
+    "future_2s",
+    "future_3s",
+    "future_1p",
+    "future_2p",
+    "future_3p",
+    "singular_imperative",
+    "plural_imperative",
+    "short",
+)
+
+form_values = operator.attrgetter(*FORMS)
 
 
 class KovolVerb:
     """A class to represent a Kovol verb defining the conjugations of it as attributes with methods for retrieving
-    those conjugations and printing to screen."""
+    those conjugations and printing to screen. Uses __slots__ as there can be thousands of verbs, each with the
+    same fixed set of forms."""
 
     vowels = (
         "i",
@@ -19,6 +49,8 @@ class KovolVerb:
         "ɔ",
     )  # Vowels in Kovol language
 
+    __slots__ = ("kovol", "english", "tpi", "author", "errors") + FORMS
+
     def __init__(self, future1s: str, english: str):
         # Meta data
         self.kovol = future1s
@@ -28,43 +60,34 @@ class KovolVerb:
         self.errors = []  # used for PredictedVerb subclass,
         # defined here to maintain template compatibility
 
-        # Remote past tense
-        self.remote_past_1s = ""
-        self.remote_past_2s = ""
-        self.remote_past_3s = ""
-        self.remote_past_1p = ""
-        self.remote_past_2p = ""
-        self.remote_past_3p = ""
-
-        # Recent past tense
-        self.recent_past_1s = ""
-        self.recent_past_2s = ""
-        self.recent_past_3s = ""
-        self.recent_past_1p = ""
-        self.recent_past_2p = ""
-        self.recent_past_3p = ""
-
-        # Future tense
+        # Remote past, recent past and future tenses, imperative and other forms
+        for form in FORMS:
+            setattr(self, form, "")
         self.future_1s = future1s
-        self.future_2s = ""
-        self.future_3s = ""
-        self.future_1p = ""
-        self.future_2p = ""
-        self.future_3p = ""
 
-        # Imperative forms
-        self.singular_imperative = ""
-        self.plural_imperative = ""
+    def paradigm(self) -> tuple:
+        """All the verb's data as a tuple, used to compare and hash verbs."""
+        return (
+            self.kovol,
+            self.english,
+            self.tpi,
+            self.author,
+            tuple(self.errors),
+        ) + form_values(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, KovolVerb):
+            return NotImplemented
+        return self.paradigm() == other.paradigm()
 
-        # Other forms
-        self.short = ""
+    def __hash__(self):
+        return hash(self.paradigm())
 
     def __str__(self):
-        string = self.get_string_repr()
-        return f"Kovol verb: {string['future_1s']}, \"{string['english']}\""
+        return f'Kovol verb: {self.future_1s}, "{self.english}"'
 
     def __repr__(self):
-        return self.__str__()
+        return "KovolVerb{p}".format(p=self.paradigm())
 
 
 def get_data_from_csv(csv_file, format="object") -> list:
@@ -80,80 +103,65 @@ def get_data_from_csv(csv_file, format="object") -> list:
         if "actor" in data[0]:
             data.pop(0)  # Remove header
 
-    # Get a list of the unique verbs (identified by English translation)
-    eng = set([v["eng"] for v in data])
-    # Get list of all data where each index is a list of dict items for each translation
-    verb_data = [[d for d in data if d["eng"] == e] for e in eng]
-
     if format == "list":
-        return verb_data
+        # Group the rows of each verb (identified by English translation) in a single pass
+        verb_data = {}
+        for d in data:
+            verb_data.setdefault(d["eng"], []).append(d)
+        return list(verb_data.values())
     elif format == "object":
-        return csv_data_to_verb_object(verb_data)
+        return paradigm_rows_to_verbs(
+            (d["actor"], d["tense"], d["mode"], d["kov"], d["eng"]) for d in data
+        )
 
 
 def csv_data_to_verb_object(verb_data: list) -> list:
     """Take a list of dicts representing a verb and return a list of Verb objects instead."""
-    verbs = []
-    for d in verb_data:
-        eng = d[0]["eng"]  # every row item contains this info
-        v = KovolVerb("", eng)  # init obj with temp 1s_future
-
-        future_tense = [v for v in d if v["tense"].lower() == "future"]
-        for t in future_tense:
-            if t["actor"].lower() == "1s":
-                v.future_1s = t["kov"]
-            elif t["actor"].lower() == "2s":
-                if not t["mode"] == "imperative":
-                    v.future_2s = t["kov"]
-            elif t["actor"].lower() == "3s":
-                v.future_3s = t["kov"]
-            elif t["actor"].lower() == "1p":
-                v.future_1p = t["kov"]
-            elif t["actor"].lower() == "2p":
-                if not t["mode"] == "imperative":
-                    v.future_2p = t["kov"]
-            elif t["actor"].lower() == "3p":
-                v.future_3p = t["kov"]
-
-        recent_past_tense = [v for v in d if v["tense"].lower() == "recent past"]
-        for t in recent_past_tense:
-            if t["actor"].lower() == "1s":
-                v.recent_past_1s = t["kov"]
-            elif t["actor"].lower() == "2s":
-                v.recent_past_2s = t["kov"]
-            elif t["actor"].lower() == "3s":
-                v.recent_past_3s = t["kov"]
-            elif t["actor"].lower() == "1p":
-                v.recent_past_1p = t["kov"]
-            elif t["actor"].lower() == "2p":
-                v.recent_past_2p = t["kov"]
-            elif t["actor"].lower() == "3p":
-                v.recent_past_3p = t["kov"]
-
-        remote_past_tense = [v for v in d if v["tense"].lower() == "remote past"]
-        for t in remote_past_tense:
-            if t["actor"].lower() == "1s":
-                v.remote_past_1s = t["kov"]
-            elif t["actor"].lower() == "2s":
-                v.remote_past_2s = t["kov"]
-            elif t["actor"].lower() == "3s":
-                v.remote_past_3s = t["kov"]
-            elif t["actor"].lower() == "1p":
-                v.remote_past_1p = t["kov"]
-            elif t["actor"].lower() == "2p":
-                v.remote_past_2p = t["kov"]
-            elif t["actor"].lower() == "3p":
-                v.remote_past_3p = t["kov"]
-
-        imperatives = [v for v in d if v["mode"]]
-        for t in imperatives:
-            if t["actor"].lower() == "2s":
-                v.singular_imperative = t["kov"]
-            elif t["actor"].lower() == "2p":
-                v.plural_imperative = t["kov"]
-            elif t["mode"].lower() == "short":
-                v.short = t["kov"]
-
-        verbs.append(v)
-    verbs = sorted(verbs, key=lambda x: x.future_1s)
-    return verbs
+    return paradigm_rows_to_verbs(
+        (d["actor"], d["tense"], d["mode"], d["kov"], d["eng"])
+        for rows in verb_data
+        for d in rows
+    )
+
+
+TENSES = {
+    "future": "future",
+    "recent past": "recent_past",
+    "remote past": "remote_past",
+}
+ACTORS = ("1s", "2s", "3s", "1p", "2p", "3p")
+
+
+@functools.lru_cache(maxsize=None)
+def conjugation_slots(tense, actor, mode) -> tuple:
+    """Return the names of the KovolVerb attributes a paradigm row fills. Worked out once for each combination of
+    tense, actor and mode as a sheet only uses a handful of them."""
+    slots = []
+    tense = TENSES.get(tense.lower())
+    actor = actor.lower()
+    if tense and actor in ACTORS:
+        # 2nd person imperatives are stored with the future tense, but aren't future forms
+        if not (tense == "future" and actor in ("2s", "2p") and mode == "imperative"):
+            slots.append("{t}_{a}".format(t=tense, a=actor))
+    if mode:
+        if actor == "2s":
+            slots.append("singular_imperative")
+        elif actor == "2p":
+            slots.append("plural_imperative")
+        elif mode.lower() == "short":
+            slots.append("short")
+    return tuple(slots)
+
+
+def paradigm_rows_to_verbs(rows) -> list:
+    """Build KovolVerb objects from (actor, tense, mode, kov, eng) rows in a single pass. Rows with the same English
+    translation belong to the same verb, a later row for the same form replaces an earlier one. Returns the verbs
+    sorted by future 1s form."""
+    verbs = {}
+    for actor, tense, mode, kov, eng in rows:
+        v = verbs.get(eng)
+        if v is None:
+            v = verbs[eng] = KovolVerb("", eng)  # init obj with temp 1s_future
+        for slot in conjugation_slots(tense, actor, mode):
+            setattr(v, slot, kov)
+    return sorted(verbs.values(), key=lambda x: x.future_1s)
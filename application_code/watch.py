@@ -0,0 +1,45 @@
+# This file contains a simple file watcher used by lexicon.py --watch to update the lexicon whenever a
+# spreadsheet is saved. Files are polled, which works on every platform and for network drives.
+import os
+import time
+
+
+def file_states(paths):
+    """Return {path: (mtime, size)}, None for files that don't exist (e.g. halfway through a save)."""
+    states = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            states[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            states[path] = None
+    return states
+
+
+def changed_paths(old, new):
+    return {path for path in new if old.get(path) != new[path]}
+
+
+def watch(paths, interval=1, debounce=2, sleep=time.sleep):
+    """Yields the set of paths that changed each time one or more of the files is saved. Checks the files every
+    interval seconds and waits until they have been left alone for debounce seconds, so a burst of autosaves only
+    gives one update. Changes made while the caller is busy are picked up on the next check."""
+    states = file_states(paths)
+    while True:
+        sleep(interval)
+        current = file_states(paths)
+        changed = changed_paths(states, current)
+        if not changed:
+            continue
+        quiet = 0
+        while quiet < debounce:
+            sleep(interval)
+            latest = file_states(paths)
+            if latest != current:
+                changed |= changed_paths(current, latest)
+                current = latest
+                quiet = 0
+            else:
+                quiet += interval
+        states = current
+        yield changed
@@ -0,0 +1,108 @@
+# This file contains the word form index: every Kovol form in the lexicon and the verb paradigms, with the ID of
+# its headword and for verbs which form it is. It's written as a sorted binary file that other tools can memory
+# map and search with bisect, so checking whether a word is known doesn't mean reading the spreadsheets again or
+# loading the whole lexicon into Python objects.
+import bisect
+import mmap
+import os
+import struct
+
+from application_code import collation
+
+INDEX_FILE = "word_forms.idx"
+MAGIC = b"LXWF"
+VERSION = 2  # 2 folds ŋ to ng in the search keys
+HEADER = struct.Struct("<4sII")  # magic, version, number of forms
+OFFSET = struct.Struct("<I")  # where each record starts, after the table of offsets
+# Each record is the search key, form, headword ID and form name separated by tabs and ending with a newline
+
+
+def record(word_form):
+    """A record as bytes, with any tabs or newlines in the values replaced by spaces."""
+    text = "\t".join(str(v).replace("\t", " ").replace("\n", " ") for v in word_form)
+    return text.encode("utf-8") + b"\n"
+
+
+def write_index(word_forms, path):
+    """Write the (search key, form, ID, form name) tuples returned by process_data.get_word_forms(), which are
+    sorted by search key, to path. The file is written alongside and then renamed, so a tool reading the index
+    never sees half a file."""
+    records = [record(f) for f in word_forms]
+    offsets = []
+    position = 0
+    for r in records:
+        offsets.append(position)
+        position += len(r)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        file.write(struct.pack("<{n}I".format(n=len(offsets)), *offsets))
+        file.writelines(records)
+    os.replace(temp_path, path)
+    return path
+
+
+class _Keys:
+    """The search keys of an index as a sequence, so they can be searched with bisect."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        return self.index.key(i)
+
+
+class WordFormIndex:
+    """A word form index file written by write_index(), opened with mmap. Opening is instant and a lookup only
+    reads the few parts of the file its binary search touches. Use as a context manager or call close()."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(
+                "{p} isn't a version {v} word form index".format(p=path, v=VERSION)
+            )
+        self._records = HEADER.size + OFFSET.size * self._count
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def start(self, i):
+        (offset,) = OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * i)
+        return self._records + offset
+
+    def key(self, i):
+        """The search key of the i-th record as UTF-8 bytes."""
+        start = self.start(i)
+        return self._map[start : self._map.find(b"\t", start)]
+
+    def lookup(self, word):
+        """Return a list of (form, headword ID, form name) for every form with the same search key as word (see
+        Collator.search_key()). The ID is returned as text and the form name is '' for words that aren't verbs."""
+        key = collation.get_collator().search_key(word).encode("utf-8")
+        found = []
+        i = bisect.bisect_left(_Keys(self), key)
+        while i < self._count and self.key(i) == key:
+            start = self.start(i)
+            line = self._map[start : self._map.find(b"\n", start)]
+            found.append(tuple(line.decode("utf-8").split("\t")[1:]))
+            i += 1
+        return found
+
+    def __contains__(self, word):
+        return bool(self.lookup(word))
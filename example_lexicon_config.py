@@ -8,6 +8,41 @@ settings = {
     # the folder the web page should be created in,
     "log_file": "/home/steve/Documents/Computing/Python_projects/Lexicon/local_output/Lexicon_error.log",
     # the abs path for the log file
+    "cache_folder": "/home/steve/Documents/Computing/Python_projects/Lexicon/local_output/cache",
+    # folder for snapshots of the parsed spreadsheets, remove to disable caching
+    "ods_reader": "lxml",
+    # 'lxml' streams .ods files with a fast built in reader, 'pyexcel' uses pyexcel-ods3
+    "processes": None,
+    # number of processes used to read spreadsheets and generate pages in parallel, None uses every CPU and 1
+    # disables it
+    "database": "/home/steve/Documents/Computing/Python_projects/Lexicon/local_output/lexicon.db",
+    # SQLite copy of the lexicon and verb rows, updated by running lexicon.py --sync-database
+    "watch_interval": 1,
+    "watch_debounce": 2,
+    # lexicon.py --watch checks the spreadsheets every watch_interval seconds and updates once they've been
+    # left alone for watch_debounce seconds
+    "validation_threads": 1,
+    # number of threads used to run the validation checks
+    "extra_validators": ["validate_date_format"],
+    # optional checks to run: validate_phonetic_characters, validate_links_both_ways, validate_date_format,
+    # validate_near_duplicates
+    "skip_validators": [],
+    # standard checks not to run, e.g. validate_entered_by
+    "near_duplicate_distance": 1,
+    # validate_near_duplicates reports words this many edits apart (letters or diacritics added, removed or changed)
+    # "phonetic_characters": "aeiouɛəɔɑbdgkmnpstwjlhβʔŋ",  # characters allowed by validate_phonetic_characters
+    "fragment_cache_size": 50,
+    # MB of rendered entries kept in the cache folder to reuse, the entries used least recently are removed first
+    "sharded_pages": False,
+    # True leaves the entries out of main_dict.html and loads each letter when it's opened or searched, so large
+    # lexicons open quickly on phones
+    "alphabet": "abcdefghijklmnŋopqrstuvwxyz",
+    # the order letters sort in, remove to sort by Unicode order. Letters left out sort after these
+    "collation_equivalences": {"ɛ": "e", "β": "b", "ə": "e", "ɑ": "a", "ʔ": "k", "ɔ": "o"},
+    # characters that sort as another letter, the words are then ordered e before ɛ etc.
+    "search_equivalences": {"ɛ": "e", "β": "b", "ə": "e", "ɑ": "a", "ʔ": "k", "ɔ": "o", "ŋ": "ng"},
+    # characters replaced when searching Kovol so it can be typed in plain ASCII, remove to use the
+    # collation_equivalences plus ŋ as ng
     # 'sort': 'phonetics',  # order dictionary by 'phonetics' or 'orthography'
     "bootstrap": "/home/steve/Documents/Computing/Python_projects/Lexicon/stylesheets/",
     "jquery": "/home/steve/Documents/Computing/Python_projects/Lexicon/stylesheets/",
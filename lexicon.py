@@ -11,6 +11,7 @@
 # 3. output takes the lexical entries identified and creates HTML and other useful formats.
 
 # This file links the layers together to form the application.
+import argparse
 import logging
 import os
 import sys
@@ -20,8 +21,12 @@ try:
     import lexicon_config
 except ModuleNotFoundError:
     import example_lexicon_config as lexicon_config
+from application_code import corpus
+from application_code import database
 from application_code import output
+from application_code import parallel
 from application_code import read_data
+from application_code import watch
 
 
 def initiate_logging():
@@ -48,6 +53,128 @@ def initiate_logging():
     return log
 
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Create the lexicon web pages from the spreadsheets defined in lexicon_config.py"
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="ignore cached spreadsheet data and rendered entries and build everything again",
+    )
+    parser.add_argument(
+        "--sync-database",
+        action="store_true",
+        help="copy changed spreadsheet rows to the SQLite database set in lexicon_config.py instead of creating "
+        "the web pages",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and update the web pages every time a spreadsheet is saved",
+    )
+    parser.add_argument(
+        "--precompile-templates",
+        action="store_true",
+        help="compile the templates into the cache folder ready for the next run, e.g. after installing",
+    )
+    parser.add_argument(
+        "--scan-corpus",
+        nargs="+",
+        metavar="TEXT_FILE",
+        help="list the words in these UTF-8 text files that aren't in the lexicon or verb paradigms in "
+        + corpus.REPORT_FILE
+        + " instead of creating the web pages",
+    )
+    return parser.parse_args()
+
+
+def load_sources(sources):
+    """Load independent data sources in parallel. sources is a dict of {name: (function, kwargs)}, new sources
+    (tag sheets, media lists...) just need adding to the dict. Returns a dict of {name: data}."""
+    data, timings, wall_time = parallel.run_jobs(
+        sources, processes=lexicon_config.settings.get("processes")
+    )
+    for name, seconds in timings.items():
+        logger.info("   -{n} loaded in {s:.2f}s".format(n=name, s=seconds))
+    logger.info(
+        "   -All data loaded in {w:.2f}s, {s:.2f}s saved by loading in parallel".format(
+            w=wall_time, s=max(sum(timings.values()) - wall_time, 0)
+        )
+    )
+    return data
+
+
+def lexicon_sources(refresh_cache=False):
+    """The data sources read by load_sources(), keyed by name."""
+    return {
+        "lexicon": (read_data.read_lexicon, {"refresh_cache": refresh_cache}),
+        "verbs": (read_data.read_verbsheet, {"refresh_cache": refresh_cache}),
+    }
+
+
+def watch_spreadsheets(data):
+    """Update the web pages whenever a spreadsheet is saved. Only the spreadsheet that changed is read again, the
+    other data, the rendered entries and the compiled templates stay in memory between updates."""
+    settings = lexicon_config.settings
+    files = {
+        "lexicon": settings["spreadsheet_name"],
+        "verbs": settings["verb_spreadsheet"],
+    }
+    sources = lexicon_sources()
+    logger.info("Watching the spreadsheets for changes, press Ctrl+C to stop")
+    try:
+        for changed in watch.watch(
+            set(files.values()),
+            interval=settings.get("watch_interval", 1),
+            debounce=settings.get("watch_debounce", 2),
+        ):
+            logger.info("Updating Lexicon")
+            try:
+                data.update(
+                    load_sources(
+                        {n: sources[n] for n, f in files.items() if f in changed}
+                    )
+                )
+                output.generate_html(data["lexicon"], verb_data=data["verbs"])
+            except Exception:
+                logger.exception(
+                    "Update failed, waiting for the spreadsheet to be saved again"
+                )
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+
+
+def sync_database(data):
+    """Bring the database set in lexicon_config.py up to date with the spreadsheets."""
+    path = lexicon_config.settings.get("database")
+    assert path, "No database is set in lexicon_config.py"
+    connection = database.connect(path)
+    try:
+        database.sync_lexicon(connection, data["lexicon"])
+        database.sync_verbs(connection, data["verbs"])
+    finally:
+        connection.close()
+
+
+def scan_corpus(data, paths):
+    """Find the words in the text files at paths missing from the lexicon, and write them to the target folder
+    most frequent first."""
+    known = corpus.known_forms(data["lexicon"], data["verbs"])
+    unknown, count = corpus.scan_corpus(
+        paths, known, processes=lexicon_config.settings.get("processes")
+    )
+    path = corpus.write_report(
+        unknown,
+        os.path.join(lexicon_config.settings["target_folder"], corpus.REPORT_FILE),
+    )
+    logger.info(
+        "{u} of {c} words ({d} different words) aren't in the lexicon, listed in {p}".format(
+            u=sum(unknown.values()), c=count, d=len(unknown), p=path
+        )
+    )
+
+
 def excepthook(exctype, value, tb):
     if exctype == AssertionError:
         logger.error(
@@ -67,12 +194,29 @@ def excepthook(exctype, value, tb):
 
 
 if __name__ == "__main__":
+    args = parse_arguments()
+    # text files are relative to where lexicon.py was run from
+    corpus_paths = [os.path.abspath(p) for p in args.scan_corpus or []]
     logger = initiate_logging()
     sys.excepthook = excepthook
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    data = read_data.read_lexicon()
-    verbs =read_data.read_verbsheet()
+    if args.precompile_templates:
+        logger.info(
+            "   -{n} templates compiled".format(n=output.precompile_templates())
+        )
+        sys.exit()
+
+    data = load_sources(lexicon_sources(refresh_cache=args.refresh_cache))
 
-    output.generate_html(data, verb_data=verbs)
+    if args.sync_database:
+        sync_database(data)
+    elif corpus_paths:
+        scan_corpus(data, corpus_paths)
+    else:
+        output.generate_html(
+            data["lexicon"], verb_data=data["verbs"], refresh_cache=args.refresh_cache
+        )
+        if args.watch:
+            watch_spreadsheets(data)
 
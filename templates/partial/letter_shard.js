@@ -0,0 +1,4 @@
+{# One initial letter of a sharded dictionary page, loaded by filter_js.html when the letter is opened or
+searched. Requires number (the letter's position on the page) and columns. #}
+{%- set html %}{% include 'partial/letter_entries.html' %}{% endset -%}
+add_letter({{number}}, {{html|tojson}});
@@ -2,6 +2,7 @@ import copy
 import datetime
 
 from application_code.process_data import LexiconEntry
+from application_code.read_data import LexiconRow
 
 settings = {
     "language": "Test",
@@ -74,86 +75,89 @@ no_sheet = settings.copy()
 no_sheet["sheet_name"] = "ImaginarySheet"
 
 good_processed_data = [
-    {
-        "ant": "",
-        "check": "",
-        "date": datetime.date(2020, 4, 30),
-        "def": "A small person",
-        "dial": "",
-        "eng": "child",
-        "enter": "Steve",
-        "ex": "ɛŋ undum",
-        "id": 1,
-        "link": "",
-        "orth": "undum__",
-        "phon": "undum",
-        "pos": "n",
-        "sense": 1,
-        "syn": "",
-        "tpi": "pikinini",
-        "trans": "my child",
-        "tag": "test",
-    },
-    {
-        "ant": "",
-        "check": "",
-        "date": datetime.date(2020, 5, 1),
-        "def": "A large person",
-        "dial": "",
-        "eng": "dad",
-        "enter": "Steve",
-        "ex": "ɛŋ inda",
-        "id": 2,
-        "link": "",
-        "orth": "",
-        "phon": "inda",
-        "pos": "n",
-        "sense": 1,
-        "syn": "",
-        "tpi": "papa",
-        "trans": "my dad",
-        "tag": "family",
-    },
-    {
-        "ant": "",
-        "check": "",
-        "date": datetime.date(2020, 5, 2),
-        "def": "Generic name for rat",
-        "dial": "",
-        "eng": "rat",
-        "enter": "Steve",
-        "ex": "om sinasim",
-        "id": 3,
-        "link": "",
-        "orth": "",
-        "phon": "sinasim",
-        "pos": "n",
-        "sense": 1,
-        "syn": "",
-        "tpi": "rat",
-        "trans": "that is a rat",
-        "tag": "animal",
-    },
-    {
-        "ant": "",
-        "check": "",
-        "date": datetime.date(2020, 5, 3),
-        "def": "A sneaky guy",
-        "dial": "",
-        "eng": "rat",
-        "enter": "Steve",
-        "ex": "",
-        "id": 3,
-        "link": "",
-        "orth": "",
-        "phon": "sinasim",
-        "pos": "n",
-        "sense": 2,
-        "syn": "",
-        "tpi": "rat",
-        "trans": "",
-        "tag": "",
-    },
+    LexiconRow.from_dict(d)
+    for d in [
+        {
+            "ant": "",
+            "check": "",
+            "date": datetime.date(2020, 4, 30),
+            "def": "A small person",
+            "dial": "",
+            "eng": "child",
+            "enter": "Steve",
+            "ex": "ɛŋ undum",
+            "id": 1,
+            "link": "",
+            "orth": "undum__",
+            "phon": "undum",
+            "pos": "n",
+            "sense": 1,
+            "syn": "",
+            "tpi": "pikinini",
+            "trans": "my child",
+            "tag": "test",
+        },
+        {
+            "ant": "",
+            "check": "",
+            "date": datetime.date(2020, 5, 1),
+            "def": "A large person",
+            "dial": "",
+            "eng": "dad",
+            "enter": "Steve",
+            "ex": "ɛŋ inda",
+            "id": 2,
+            "link": "",
+            "orth": "",
+            "phon": "inda",
+            "pos": "n",
+            "sense": 1,
+            "syn": "",
+            "tpi": "papa",
+            "trans": "my dad",
+            "tag": "family",
+        },
+        {
+            "ant": "",
+            "check": "",
+            "date": datetime.date(2020, 5, 2),
+            "def": "Generic name for rat",
+            "dial": "",
+            "eng": "rat",
+            "enter": "Steve",
+            "ex": "om sinasim",
+            "id": 3,
+            "link": "",
+            "orth": "",
+            "phon": "sinasim",
+            "pos": "n",
+            "sense": 1,
+            "syn": "",
+            "tpi": "rat",
+            "trans": "that is a rat",
+            "tag": "animal",
+        },
+        {
+            "ant": "",
+            "check": "",
+            "date": datetime.date(2020, 5, 3),
+            "def": "A sneaky guy",
+            "dial": "",
+            "eng": "rat",
+            "enter": "Steve",
+            "ex": "",
+            "id": 3,
+            "link": "",
+            "orth": "",
+            "phon": "sinasim",
+            "pos": "n",
+            "sense": 2,
+            "syn": "",
+            "tpi": "rat",
+            "trans": "",
+            "tag": "",
+        },
+    ]
 ]
 
 repeated_sense_processed_data = copy.deepcopy(good_processed_data)
@@ -175,26 +179,28 @@ id_missing_processed_data = copy.deepcopy(
     good_processed_data
 )  # an entry assigned ID 0 by read_lexicon()
 id_missing_processed_data.append(
-    {
-        "ant": "",
-        "check": "",
-        "date": datetime.date(2020, 7, 3),
-        "def": "",
-        "dial": "",
-        "eng": "Mushrooom",
-        "enter": "Steve",
-        "ex": "",
-        "id": 0,
-        "link": "",
-        "orth": "",
-        "phon": "mutol",
-        "pos": "n",
-        "sense": 1,
-        "syn": "",
-        "tpi": "talinga",
-        "trans": "",
-        "tag": "",
-    }
+    LexiconRow.from_dict(
+        {
+            "ant": "",
+            "check": "",
+            "date": datetime.date(2020, 7, 3),
+            "def": "",
+            "dial": "",
+            "eng": "Mushrooom",
+            "enter": "Steve",
+            "ex": "",
+            "id": 0,
+            "link": "",
+            "orth": "",
+            "phon": "mutol",
+            "pos": "n",
+            "sense": 1,
+            "syn": "",
+            "tpi": "talinga",
+            "trans": "",
+            "tag": "",
+        }
+    )
 )
 
 id_0_repeated = copy.deepcopy(id_missing_processed_data)
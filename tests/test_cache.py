@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pyexcel_io
+
+import tests.fixtures
+from application_code import cache
+from application_code import read_data
+
+
+class SnapshotCacheTests(unittest.TestCase):
+    """Test the snapshot cache used to skip parsing unchanged spreadsheets"""
+
+    def setUp(self):
+        self.cache_folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.cache_folder, "source.ods")
+        with open(self.source, "w") as file:
+            file.write("spreadsheet contents")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_snapshot_round_trip(self):
+        cache.store_snapshot(self.cache_folder, self.source, "lexicon", "key", [1, 2])
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "key")
+        self.assertEqual([1, 2], data, "Cached data not returned")
+
+    def test_snapshot_missing(self):
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "key")
+        self.assertIsNone(data, "Data returned without a snapshot")
+
+    def test_snapshot_key_changed(self):
+        cache.store_snapshot(self.cache_folder, self.source, "lexicon", "key", [1])
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "other")
+        self.assertIsNone(data, "Snapshot used with different settings")
+
+    def test_snapshot_source_changed(self):
+        cache.store_snapshot(self.cache_folder, self.source, "lexicon", "key", [1])
+        with open(self.source, "w") as file:
+            file.write("edited contents")
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "key")
+        self.assertIsNone(data, "Snapshot used after the source changed")
+
+    def test_snapshot_source_touched(self):
+        """Saving the file without changing it shouldn't invalidate the snapshot"""
+        cache.store_snapshot(self.cache_folder, self.source, "lexicon", "key", [1])
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "key")
+        self.assertEqual([1], data, "Snapshot not used for identical contents")
+
+    def test_clear_cache(self):
+        cache.store_snapshot(self.cache_folder, self.source, "lexicon", "key", [1])
+        cache.clear_cache(self.cache_folder)
+        data = cache.load_snapshot(self.cache_folder, self.source, "lexicon", "key")
+        self.assertIsNone(data, "Snapshot survived clearing the cache")
+
+    def test_read_lexicon_uses_cache(self):
+        settings = tests.fixtures.settings.copy()
+        settings["cache_folder"] = self.cache_folder
+        with patch("tests.fixtures.settings", settings):
+            data = read_data.read_lexicon(config_file=tests.fixtures)
+            with patch("pyexcel_io.iget_data", wraps=pyexcel_io.iget_data) as get_data:
+                cached_data = read_data.read_lexicon(config_file=tests.fixtures)
+                get_data.assert_not_called()
+                read_data.read_lexicon(config_file=tests.fixtures, refresh_cache=True)
+                get_data.assert_called_once()
+        self.assertEqual(data, cached_data, "Cached data differs from spreadsheet")
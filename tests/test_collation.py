@@ -0,0 +1,96 @@
+import copy
+import unittest
+
+import example_lexicon_config
+from application_code import collation
+from application_code import process_data
+from tests import fixtures
+
+
+class CollationTests(unittest.TestCase):
+    """Test the sort keys used to put the dictionary in alphabetical order"""
+
+    def test_default_equivalences(self):
+        collator = collation.Collator()
+        words = ["ʔib", "ɛlɛ", "fa", "ebo", "Ele", "ele", "kia"]
+        self.assertEqual(
+            ["ebo", "Ele", "ele", "ɛlɛ", "fa", "kia", "ʔib"],
+            sorted(words, key=collator.sort_key),
+        )
+
+    def test_alphabet_order(self):
+        collator = collation.Collator("anŋgɛ", {"ɑ": "a"})
+        words = ["ga", "ŋa", "na", "ɛ", "ɑn", "an"]
+        self.assertEqual(
+            ["an", "ɑn", "na", "ŋa", "ga", "ɛ"], sorted(words, key=collator.sort_key)
+        )
+        self.assertEqual(collator.primary_key("ɑn"), collator.primary_key("AN"))
+
+    def test_letters_missing_from_alphabet_sort_last(self):
+        collator = collation.Collator("tanŋ", {"ɑ": "a"})
+        words = ["xa", "ŋa", "ta", "ca", "a ŋ", "aŋ", "ɑt"]
+        self.assertEqual(
+            ["ta", "a ŋ", "ɑt", "aŋ", "ŋa", "ca", "xa"],
+            sorted(words, key=collator.sort_key),
+        )
+
+    def test_accents_sort_after_letters(self):
+        collator = collation.Collator("aelzɛ", {"ɛ": "e"})
+        nfd = "ɛ\u0303lɛ"
+        words = ["ez", nfd, "ea", "\u00e3l", "al", "a\u0303z", "ele"]
+        self.assertEqual(
+            ["al", "\u00e3l", "a\u0303z", "ea", "ele", nfd, "ez"],
+            sorted(words, key=collator.sort_key),
+        )
+
+    def test_sort_key_same_for_nfc_and_nfd(self):
+        collator = collation.Collator("aelz")
+        self.assertEqual(collator.sort_key("\u00e3l"), collator.sort_key("a\u0303l"))
+        self.assertEqual(collator.primary_key("al"), collator.primary_key("\u00c3l"))
+
+    def test_search_key(self):
+        collator = collation.Collator("anŋgɛ", {"ɛ": "e", "ʔ": "k"})
+        self.assertEqual("eleng", collator.search_key("Ɛ́lɛŋ"))
+        self.assertEqual("kib", collator.search_key("ʔib"))
+
+    def test_search_equivalences(self):
+        collator = collation.Collator("anŋg", {}, {"ŋ": "ng", "ɛ": "e"})
+        self.assertEqual("limong", collator.search_key("limoŋ"))
+        self.assertEqual(
+            ["na", "ŋa", "ga"], sorted(["ga", "ŋa", "na"], key=collator.sort_key)
+        )
+
+    def test_search_keys_ascii_for_example_alphabet(self):
+        settings = example_lexicon_config.settings
+        collator = collation.get_collator(settings)
+        letters = set(settings["alphabet"]) | set(settings["collation_equivalences"])
+        for letter in letters:
+            for word in (letter, letter.upper(), letter + "\u0301"):
+                key = collator.search_key(word)
+                self.assertTrue(all(ord(c) < 128 for c in key), key)
+        settings = dict(settings)
+        del settings["search_equivalences"]
+        self.assertEqual("limong", collation.get_collator(settings).search_key("limoŋ"))
+
+    def test_entries_have_search_keys(self):
+        data = copy.deepcopy(fixtures.good_processed_data)
+        data[0].dial = "ɛ́nda"
+        entries = process_data.create_lexicon_entries(data)
+        keys = [e.search_keys for e in entries if e.headword == data[0].orth][0]
+        self.assertIn("enda", keys, "Dialect variant not searchable")
+
+    def test_get_collator_compiled_once(self):
+        settings = fixtures.settings.copy()
+        settings["alphabet"] = "ab"
+        collator = collation.get_collator(settings)
+        self.assertIs(collator, collation.get_collator(settings.copy()))
+        settings["collation_equivalences"] = {}
+        self.assertIsNot(collator, collation.get_collator(settings))
+
+    def test_entries_sorted_with_cached_keys(self):
+        entries = process_data.create_lexicon_entries(fixtures.good_processed_data)
+        keys = [e.sort_key for e in entries]
+        self.assertEqual(sorted(keys), keys, "Entries not in collation order")
+        self.assertEqual(
+            collation.get_collator().sort_key(entries[0].headword), entries[0].sort_key
+        )
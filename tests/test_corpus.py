@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from application_code import corpus
+from tests import fixtures
+
+VERB_DATA = [
+    ["ID", "actor", "tense", "mode", "kov", "eng"],
+    [1, "1s", "future", "", "ɛlɛ", "go"],
+    [1, "1s", "recent past", "", "ɛlɛpum", "go"],
+]
+
+
+class CorpusTests(unittest.TestCase):
+    """Test the scanner that finds words in texts that are missing from the lexicon"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write_text(self, name, text):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_scan_file(self):
+        known = corpus.known_forms(fixtures.good_processed_data, VERB_DATA)
+        path = self.write_text(
+            "one.txt", "Ɛlɛpum undum, 12 ʔib-sinasim.\nundúm gau Gau"
+        )
+        unknown, count = corpus.scan_file(path, known)
+        self.assertEqual(Counter({"gau": 2, "ʔib": 1}), unknown)
+        self.assertEqual(7, count)
+        self.assertEqual(
+            (unknown, count),
+            corpus.scan_file(path, known, chunk_size=2),
+            "Words split between chunks",
+        )
+
+    def test_known_forms(self):
+        known = corpus.known_forms(fixtures.good_processed_data, VERB_DATA)
+        self.assertTrue({"undum", "inda", "elepum"} <= known)
+        self.assertNotIn("kov", known, "Verb sheet header included")
+
+    def test_scan_corpus(self):
+        known = corpus.known_forms(fixtures.good_processed_data, VERB_DATA)
+        paths = [
+            self.write_text("one.txt", "undum elɛpum gau gau"),
+            self.write_text("two.txt", "Gau ina inda"),
+        ]
+        unknown, count = corpus.scan_corpus(paths, known, processes=1)
+        self.assertEqual(Counter({"gau": 3, "ina": 1}), unknown)
+        self.assertEqual(7, count)
+
+        report = corpus.write_report(unknown, os.path.join(self.folder, "out.csv"))
+        with open(report, encoding="utf-8") as file:
+            self.assertEqual(["word,count", "gau,3", "ina,1"], file.read().split())
@@ -0,0 +1,78 @@
+import datetime
+import unittest
+
+import tests.fixtures
+from application_code import database
+from application_code import read_data
+
+
+class DatabaseTests(unittest.TestCase):
+    """Test the SQLite store of lexicon and verb rows"""
+
+    def setUp(self):
+        self.connection = database.connect(":memory:")
+        self.data = read_data.read_lexicon(config_file=tests.fixtures)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_tables_and_indexes_created(self):
+        names = {
+            name
+            for (name,) in self.connection.execute("SELECT name FROM sqlite_master")
+        }
+        self.assertTrue({"lexicon", "verbs"} <= names, "Tables not created")
+        for column in database.INDEXED_COLUMNS:
+            self.assertIn("lexicon_" + column, names, "Index not created")
+
+    def test_sync_round_trip(self):
+        database.sync_lexicon(self.connection, self.data)
+        rows = database.read_lexicon(self.connection)
+        self.assertEqual(
+            sorted(self.data, key=lambda r: (r.id, r.sense)), rows, "Rows changed"
+        )
+        self.assertIsInstance(rows[0], read_data.LexiconRow)
+
+    def test_sync_only_writes_changes(self):
+        self.assertEqual(
+            (len(self.data), 0), database.sync_lexicon(self.connection, self.data)
+        )
+        self.assertEqual((0, 0), database.sync_lexicon(self.connection, self.data))
+        edited = list(self.data)
+        edited[0] = read_data.LexiconRow.from_dict(dict(edited[0], eng="edited"))
+        del edited[1]
+        self.assertEqual((1, 2), database.sync_lexicon(self.connection, edited))
+        self.assertEqual(len(edited), len(database.read_lexicon(self.connection)))
+
+    def test_duplicate_rows_kept(self):
+        data = [self.data[0], self.data[0]]
+        self.assertEqual((1, 0), database.sync_lexicon(self.connection, data))
+        self.assertEqual(data, database.read_lexicon(self.connection))
+        self.assertEqual((0, 0), database.sync_lexicon(self.connection, data[:1]))
+        self.assertEqual(data[:1], database.read_lexicon(self.connection))
+
+    def test_indexed_queries(self):
+        row = read_data.LexiconRow(1, "a", "a", date=datetime.date(2020, 4, 30))
+        data = [row, read_data.LexiconRow(2, "b", "a"), read_data.LexiconRow(3, "c")]
+        database.sync_lexicon(self.connection, data)
+        self.assertEqual([row], database.read_lexicon(self.connection, orth="a"))
+        self.assertEqual([row], database.read_lexicon(self.connection, date=row.date))
+        self.assertEqual(["a"], database.repeated_values(self.connection, "phon"))
+        with self.assertRaises(KeyError):
+            database.repeated_values(self.connection, "imaginary")
+
+    def test_sync_verbs(self):
+        verbs = [
+            [1, "1s", "future", "", "ɛlɛ", "go", "checked"],
+            [1, "2s", "past", "", "ɛlɛ", "go"],
+        ]
+        self.assertEqual((2, 0), database.sync_verbs(self.connection, verbs))
+        self.assertEqual((0, 1), database.sync_verbs(self.connection, verbs[:1]))
+        self.assertEqual(
+            [(1, "1s", "future", "", "ɛlɛ", "go")],
+            list(
+                self.connection.execute(
+                    "SELECT verb_id, actor, tense, mode, kov, eng FROM verbs"
+                )
+            ),
+        )
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from application_code import fragments
+
+
+class FragmentStoreTests(unittest.TestCase):
+    """Test the size limited store of rendered entries"""
+
+    def setUp(self):
+        self.cache_folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.cache_folder, fragments.STORE_NAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_store_kept_on_disk(self):
+        store = fragments.FragmentStore(self.path)
+        store.add({"a": "<p>undum</p>", "b": "<p>ɛlɛ</p>"})
+        store.connection.close()
+        store = fragments.FragmentStore(self.path)
+        self.assertEqual({"a": "<p>undum</p>"}, store.get(["a", "c"]))
+        self.assertEqual(len("<p>undum</p><p>ɛlɛ</p>".encode("utf-8")), store.size())
+        store.clear()
+        self.assertEqual({}, store.get(["a", "b"]))
+        store.connection.close()
+
+    def test_evict_least_recently_used(self):
+        store = fragments.FragmentStore(max_bytes=30)
+        store.add({"a": "a" * 10, "b": "b" * 10})
+        store.new_build()
+        store.add({"c": "c" * 10})
+        store.get(["a"])
+        self.assertEqual(0, store.evict(), "Store within its limit")
+        store.new_build()
+        store.add({"d": "d" * 10})
+        self.assertEqual(1, store.evict())
+        self.assertEqual({"a", "c", "d"}, set(store.get(["a", "b", "c", "d"])))
+        self.assertEqual(30, store.size())
+
+    def test_get_many_keys(self):
+        store = fragments.FragmentStore()
+        store.add({str(i): "<p>{i}</p>".format(i=i) for i in range(1200)})
+        self.assertEqual(1200, len(store.get(str(i) for i in range(1200))))
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from application_code import fuzzy
+
+
+class FuzzyTests(unittest.TestCase):
+    """Test the index used to find words that are spelt almost the same"""
+
+    def test_edit_distance(self):
+        self.assertEqual(0, fuzzy.edit_distance("undum", "undum"))
+        self.assertEqual(1, fuzzy.edit_distance("undum", "undu"))
+        self.assertEqual(1, fuzzy.edit_distance("ɛlɛ", "ɛla"))
+        self.assertEqual(3, fuzzy.edit_distance("kitten", "sitting"))
+        self.assertEqual(2, fuzzy.edit_distance("kitten", "sitting", limit=1))
+
+    def test_deletions(self):
+        self.assertEqual({"abc", "ab", "ac", "bc"}, fuzzy.deletions("abc", 1))
+        self.assertIn("a", fuzzy.deletions("abc", 2))
+
+    def test_near_pairs(self):
+        words = ["undum", "sinasim", "undu", fuzzy.normalise("undúm"), "sinesem"]
+        self.assertEqual(
+            [(0, 2, 1), (0, 3, 1)], list(fuzzy.near_pairs(words, distance=1))
+        )
+        self.assertIn((1, 4, 2), list(fuzzy.near_pairs(words, distance=2)))
+
+    def test_near_pairs_match_all_pairs(self):
+        generator = random.Random(1)
+        words = [
+            "".join(generator.choice("aeiku") for _ in range(generator.randint(3, 6)))
+            for _ in range(300)
+        ]
+        expected = [
+            (i, j, fuzzy.edit_distance(words[i], words[j]))
+            for i in range(len(words))
+            for j in range(i + 1, len(words))
+            if words[i] != words[j] and fuzzy.edit_distance(words[i], words[j]) <= 1
+        ]
+        self.assertEqual(expected, list(fuzzy.near_pairs(words, distance=1)))
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from application_code import fragments
+from application_code import incremental
+from application_code import process_data
+from tests import fixtures
+
+
+class IncrementalBuildTests(unittest.TestCase):
+    """Test reusing the entries rendered by earlier builds"""
+
+    def setUp(self):
+        self.cache_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_render_entries_reuses_fragments(self):
+        template = Mock()
+        template.render.side_effect = lambda entry: "<p>{h}</p>".format(
+            h=entry.headword
+        )
+        entries = process_data.create_lexicon_entries(fixtures.good_processed_data)
+        store = fragments.FragmentStore()
+        self.assertEqual(
+            len(entries), incremental.render_entries(template, entries, store, "1")
+        )
+        self.assertEqual("<p>{h}</p>".format(h=entries[0].headword), entries[0].html)
+
+        entries = process_data.create_lexicon_entries(
+            fixtures.missing_pos_processed_data
+        )
+        self.assertEqual(1, incremental.render_entries(template, entries, store, "1"))
+        self.assertEqual(
+            len(entries),
+            incremental.render_entries(template, entries, store, "2"),
+            "Template change didn't render every entry",
+        )
+
+    def test_template_version_changes(self):
+        template_dir = os.path.join(self.cache_folder, "templates")
+        os.mkdir(template_dir)
+        with open(os.path.join(template_dir, "page.html"), "w") as file:
+            file.write("{{ entry }}")
+        version = incremental.template_version(template_dir)
+        self.assertEqual(version, incremental.template_version(template_dir))
+        with open(os.path.join(template_dir, "page.html"), "w") as file:
+            file.write("<p>{{ entry }}</p>")
+        self.assertNotEqual(version, incremental.template_version(template_dir))
@@ -1,9 +1,13 @@
+import copy
 import datetime
 import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 
 from application_code import output
+from application_code import process_data
 from tests import fixtures
 
 
@@ -21,7 +25,11 @@ class HTMLGenerationTests(unittest.TestCase):
         for file in os.listdir(self.test_folder):
             if file == "blank_file":
                 continue
-            os.remove(os.path.join(self.test_folder, file))
+            path = os.path.join(self.test_folder, file)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
 
     def test_generate_html(self):
         with patch("lexicon_config.settings", fixtures.settings):
@@ -29,6 +37,45 @@ class HTMLGenerationTests(unittest.TestCase):
 
         self.assertTrue(os.path.exists(self.lex_page))
 
+    def test_generate_html_validates_in_one_pass(self):
+        with patch("lexicon_config.settings", fixtures.settings):
+            with patch(
+                "application_code.process_data.run_validators",
+                wraps=process_data.run_validators,
+            ) as run_validators:
+                output.generate_html(fixtures.missing_pos_processed_data)
+                output.generate_html(fixtures.missing_pos_processed_data)
+        self.assertEqual(2, run_validators.call_count, "Not one pass per build")
+        self.assertIs(
+            fixtures.missing_pos_processed_data, run_validators.call_args[0][0]
+        )
+
+    def test_generate_html_in_parallel(self):
+        settings = fixtures.settings.copy()
+        settings["processes"] = 2
+        with patch("lexicon_config.settings", settings):
+            output.generate_html(fixtures.missing_pos_processed_data)
+        for name in ("main_dict.html", "errors.html", "word_forms.idx"):
+            self.assertTrue(os.path.exists(os.path.join(self.test_folder, name)))
+
+    def test_generate_html_in_parallel_reuses_entries(self):
+        settings = fixtures.settings.copy()
+        settings["processes"] = 2
+        with patch("lexicon_config.settings", settings):
+            output.fragment_store().clear()
+            output.generate_html(fixtures.good_processed_data)
+            with self.assertLogs("LexiconLog", "INFO") as logs:
+                output.generate_html(fixtures.good_processed_data)
+        self.assertIn(
+            "-0 of 3 entries", "\n".join(logs.output), "Entries rendered again"
+        )
+
+    def test_page_jobs(self):
+        jobs = output.page_jobs(fixtures.good_processed_data, None)
+        self.assertEqual(["Word form index"], list(jobs))
+        jobs = output.page_jobs(fixtures.good_processed_data, ["error"])
+        self.assertIn("Error page", jobs)
+
     def test_generate_lexicon_page_exists(self):
         with patch("lexicon_config.settings", fixtures.settings):
             output.generate_lexicon_page(fixtures.good_processed_data, None)
@@ -48,6 +95,41 @@ class HTMLGenerationTests(unittest.TestCase):
                 datetime.datetime.now().strftime("%A %d %B %Y"), file, "Date missing"
             )
 
+    def test_generate_lexicon_page_search_index(self):
+        with patch("lexicon_config.settings", fixtures.settings):
+            output.generate_lexicon_page(fixtures.good_processed_data, None)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.test_folder, "search_index.js"))
+        )
+        with open(self.lex_page, "r") as file:
+            self.assertIn('id="entry_0"', file.read(), "Entry ids missing")
+
+    def test_generate_lexicon_page_sharded(self):
+        settings = fixtures.settings.copy()
+        settings["sharded_pages"] = True
+        with patch("lexicon_config.settings", settings):
+            output.generate_lexicon_page(fixtures.good_processed_data, None)
+        with open(self.lex_page, "r") as file:
+            page = file.read()
+        self.assertNotIn('id="entry_0"', page, "Entries not left out")
+        self.assertIn('data-shard="0"', page)
+        self.assertNotIn('src="search_index.js"', page, "Search index loaded upfront")
+        folder = os.path.join(self.test_folder, output.SHARD_FOLDER)
+        self.assertEqual(["0.js", "1.js", "2.js"], sorted(os.listdir(folder)))
+        with open(os.path.join(folder, "0.js"), encoding="utf-8") as file:
+            shard = file.read()
+        self.assertTrue(shard.startswith('add_letter(0, "'))
+        self.assertIn(r"id=\"entry_0\"", shard)
+        self.assertIn("ɛŋ inda", shard, "Shard not in UTF-8")
+
+    def test_generate_lexicon_page_capitalised_headword(self):
+        data = copy.deepcopy(fixtures.good_processed_data)
+        data[0]["orth"] = "Capital"
+        with patch("lexicon_config.settings", fixtures.settings):
+            output.generate_lexicon_page(data, None)
+        with open(self.lex_page, "r") as file:
+            self.assertIn("Capital", file.read(), "Capitalised headword missing")
+
     def test_generate_error_page_with_repeated_sense_errors(self):
         with patch("lexicon_config.settings", fixtures.settings):
             output.generate_html(fixtures.repeated_sense_processed_data)
@@ -90,6 +172,28 @@ class HTMLGenerationTests(unittest.TestCase):
             "Error message should be showing",
         )
 
+    def test_error_page_shows_validator_timings(self):
+        with patch("lexicon_config.settings", fixtures.settings):
+            output.generate_html(fixtures.missing_pos_processed_data)
+        with open(self.error_page, "r") as file:
+            file = file.read()
+        self.assertIn("<h3>Validation checks</h3>", file, "Timings missing")
+        self.assertIn("<td>validate_find_missing_pos</td>", file, "Check not listed")
+
+    def test_error_page_timings_on_every_build(self):
+        with patch("lexicon_config.settings", fixtures.settings):
+            output.generate_html(fixtures.missing_pos_processed_data)
+            with self.assertLogs("LexiconLog", "INFO") as logs:
+                output.generate_html(fixtures.missing_pos_processed_data)
+            validators = process_data.enabled_validators()
+        with open(self.error_page, "r") as file:
+            file = file.read()
+        self.assertIn("<h3>Validation checks</h3>", file, "Timings missing")
+        log = "\n".join(logs.output)
+        for v in validators:
+            self.assertIn("<td>{n}</td>".format(n=v.name), file, "Check not listed")
+            self.assertIn("-{n} found".format(n=v.name), log, "Check not logged")
+
     def test_error_page_multiple_errors(self):
         with patch("lexicon_config.settings", fixtures.settings):
             output.generate_html(fixtures.multiple_error_processed_data)
@@ -135,6 +239,40 @@ class HTMLGenerationTests(unittest.TestCase):
             output.assert_templates_exist(template_dir="Fake directory")
             self.assertIn("Template:", str(error.exception))
 
+    def test_template_bytecode_cache(self):
+        cache_folder = tempfile.mkdtemp()
+        settings = fixtures.settings.copy()
+        settings["cache_folder"] = cache_folder
+        try:
+            with patch("lexicon_config.settings", settings):
+                count = output.precompile_templates()
+                env = output.template_environment()
+                self.assertIs(env, output.template_environment(), "Not shared")
+            compiled = os.listdir(os.path.join(cache_folder, output.TEMPLATE_CACHE))
+        finally:
+            shutil.rmtree(cache_folder)
+        self.assertEqual(len(env.list_templates()), count)
+        self.assertEqual(count, len(compiled), "Templates not in the bytecode cache")
+        with patch("lexicon_config.settings", fixtures.settings):
+            with self.assertRaises(AssertionError):
+                output.precompile_templates()
+
+    def test_write_page(self):
+        env = output.template_environment()
+        output.write_page(
+            env.from_string("<p>{{ word }}</p>"), self.lex_page, word="inda"
+        )
+        with open(self.lex_page, encoding="utf-8") as file:
+            self.assertEqual("<p>inda</p>\n", file.read())
+
+        with self.assertRaises(ZeroDivisionError):
+            output.write_page(env.from_string("<p>{{ 1 / 0 }}</p>"), self.lex_page)
+        with open(self.lex_page, encoding="utf-8") as file:
+            self.assertEqual("<p>inda</p>\n", file.read(), "Page half written")
+        self.assertEqual(
+            ["blank_file", "main_dict.html"], sorted(os.listdir(self.test_folder))
+        )
+
     def test_generate_context(self):
         with patch("lexicon_config.settings", fixtures.settings):
             context = output.generate_context("title", "header")
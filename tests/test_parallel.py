@@ -0,0 +1,86 @@
+import logging
+import os
+import unittest
+
+from application_code import parallel
+
+
+def add(a, b):
+    return a + b
+
+
+def process_id():
+    return os.getpid()
+
+
+def fail():
+    raise KeyError("Bad sheet")
+
+
+def log_message(text):
+    logging.getLogger("LexiconLog").info(text)
+
+
+def log_and_fail():
+    try:
+        fail()
+    except KeyError:
+        logging.getLogger("LexiconLog").exception("Sheet not read")
+        raise
+
+
+class RunJobsTests(unittest.TestCase):
+    """Test the helper that runs independent jobs on a process pool"""
+
+    def test_run_jobs_results(self):
+        results, timings, wall_time = parallel.run_jobs(
+            {"one": (add, {"a": 1, "b": 2}), "two": (add, {"a": 3, "b": 4})}
+        )
+        self.assertEqual({"one": 3, "two": 7}, results)
+        self.assertEqual({"one", "two"}, set(timings))
+        self.assertGreaterEqual(wall_time, 0)
+
+    def test_run_jobs_uses_other_processes(self):
+        results, _, _ = parallel.run_jobs(
+            {"one": (process_id, {}), "two": (process_id, {})}, processes=2
+        )
+        self.assertNotIn(os.getpid(), results.values(), "Jobs not run in a pool")
+
+    def test_run_jobs_single_process(self):
+        results, _, _ = parallel.run_jobs(
+            {"one": (process_id, {}), "two": (process_id, {})}, processes=1
+        )
+        self.assertEqual({os.getpid()}, set(results.values()))
+
+    def test_run_jobs_raises_job_errors(self):
+        with self.assertRaises(KeyError) as error:
+            parallel.run_jobs({"one": (fail, {}), "two": (add, {"a": 1, "b": 1})})
+        self.assertIn("Bad sheet", str(error.exception))
+
+    def test_run_jobs_local_jobs(self):
+        results, timings, _ = parallel.run_jobs(
+            {"one": (process_id, {}), "two": (process_id, {})},
+            processes=2,
+            local_jobs={"here": (process_id, {})},
+        )
+        self.assertEqual(os.getpid(), results["here"], "Local job not run here")
+        self.assertNotEqual(os.getpid(), results["one"])
+        self.assertEqual({"one", "two", "here"}, set(timings))
+
+    def test_run_jobs_logs_worker_messages(self):
+        with self.assertLogs("LexiconLog", "INFO") as logs:
+            parallel.run_jobs(
+                {"one": (log_message, {"text": "one"}), "two": (add, {"a": 1, "b": 1})},
+                processes=2,
+            )
+        self.assertEqual(["INFO:LexiconLog:one"], logs.output)
+
+    def test_run_jobs_logs_worker_messages_before_errors(self):
+        with self.assertLogs("LexiconLog", "INFO") as logs:
+            with self.assertRaises(KeyError):
+                parallel.run_jobs(
+                    {"one": (log_and_fail, {}), "two": (add, {"a": 1, "b": 1})},
+                    processes=2,
+                )
+        self.assertIn("ERROR:LexiconLog:Sheet not read", logs.output[0])
+        self.assertIn("KeyError: 'Bad sheet'", logs.output[0], "Traceback missing")
@@ -1,6 +1,9 @@
+import datetime
 import unittest
+from unittest.mock import patch
 
 from application_code import process_data
+from application_code import read_data
 from tests import fixtures
 
 
@@ -156,6 +159,156 @@ class ValidationTests(unittest.TestCase):
             ["sinasim has sense numbers [2, 3]"], rtn.error_data, "Incorrect error data"
         )
 
+    def test_validation_index(self):
+        index = process_data.ValidationIndex(fixtures.id_0_repeated)
+        self.assertNotIn(0, index.by_id, "ID 0 indexed")
+        for row in fixtures.id_0_repeated:
+            self.assertIn(row, index.by_phon[row.phon])
+        self.assertEqual(
+            [r for r in fixtures.id_0_repeated if r.id == 2], index.by_id[2]
+        )
+
+    def test_run_validators_shares_index(self):
+        data = fixtures.words_unique_processed_data
+        with patch(
+            "application_code.process_data.ValidationIndex",
+            wraps=process_data.ValidationIndex,
+        ) as index:
+            results = process_data.run_validators(data)
+            index.assert_called_once()
+        for name, validator in process_data.VALIDATORS.items():
+            if not validator.optional:
+                expected = validator.function(data)
+                self.assertEqual(
+                    expected and expected.error_data,
+                    results[name] and results[name].error_data,
+                    "Shared index gives different errors",
+                )
+
+
+class ValidatorRegistryTests(unittest.TestCase):
+    """Test registering, choosing and timing validators"""
+
+    def test_standard_validators_enabled(self):
+        names = [v.name for v in process_data.enabled_validators(fixtures.settings)]
+        self.assertIn("validate_words_unique", names)
+        self.assertNotIn("validate_date_format", names, "Optional check enabled")
+
+    def test_merge_errors_order(self):
+        results = {
+            "validate_missing_id": process_data.DataValidationError(
+                "ID number is missing", ["a"]
+            ),
+            "validate_translation_missing": process_data.DataValidationError(
+                "Example is missing a translation", ["b"]
+            ),
+            "validate_date_format": process_data.DataValidationError(
+                "Date in unusual format", ["c"]
+            ),
+        }
+        errors = process_data.merge_errors([results])
+        self.assertEqual(
+            [
+                "Example is missing a translation",
+                "ID number is missing",
+                "Date in unusual format",
+            ],
+            [e.error_type for e in errors],
+        )
+        self.assertLessEqual(
+            set(process_data.ERROR_ORDER), set(process_data.VALIDATORS), "Unknown name"
+        )
+
+    def test_enabled_validators_settings(self):
+        settings = fixtures.settings.copy()
+        settings["extra_validators"] = ["validate_date_format"]
+        settings["skip_validators"] = ["validate_entered_by"]
+        names = [v.name for v in process_data.enabled_validators(settings)]
+        self.assertIn("validate_date_format", names, "Optional check not enabled")
+        self.assertNotIn("validate_entered_by", names, "Check not skipped")
+
+    def test_register_validator_unknown_field(self):
+        with self.assertRaises(ValueError):
+            process_data.validator("imaginary_field")
+
+    def test_run_validators_threads_and_timings(self):
+        data = fixtures.multiple_error_processed_data
+        validators = process_data.enabled_validators(fixtures.settings)
+        timings = {}
+        results = process_data.run_validators(data, validators, threads=4)
+        serial = process_data.run_validators(data, validators, timings=timings)
+        self.assertEqual(
+            {n: r and r.error_data for n, r in serial.items()},
+            {n: r and r.error_data for n, r in results.items()},
+            "Threads give different results",
+        )
+        self.assertEqual(set(serial), set(timings), "Validator not timed")
+        errors = process_data.merge_errors([results])
+        report = process_data.timing_report(timings, errors)
+        self.assertEqual(len(validators), len(report))
+        counts = {name: count for name, _, count in report}
+        self.assertEqual(1, counts["validate_find_missing_pos"])
+        self.assertEqual(0, counts["validate_entered_by"])
+
+    def test_validate_phonetic_characters(self):
+        settings = fixtures.settings.copy()
+        settings["phonetic_characters"] = "abcdefghijklmnopqrstuvwxyz"
+        data = [
+            read_data.LexiconRow(1, phon="ʔum bul"),
+            read_data.LexiconRow(2, phon="ok"),
+        ]
+        with patch("lexicon_config.settings", settings):
+            rtn = process_data.validate_phonetic_characters(data)
+        self.assertEqual(["ʔum bul contains ʔ"], rtn.error_data)
+
+    def test_validate_links_both_ways(self):
+        data = [
+            read_data.LexiconRow(1, "big", "bik", syn="nomo, huge"),
+            read_data.LexiconRow(2, "", "nomo", syn="bik"),
+            read_data.LexiconRow(3, "", "kis", ant="bik"),
+        ]
+        rtn = process_data.validate_links_both_ways(data)
+        self.assertEqual(
+            [
+                "bik lists huge as a synonym but huge doesn't link back",
+                "kis lists bik as an antonym but bik doesn't link back",
+            ],
+            rtn.error_data,
+        )
+
+    def test_validate_date_format(self):
+        data = [
+            read_data.LexiconRow(1, phon="ok", date=datetime.date(2020, 7, 3)),
+            read_data.LexiconRow(2, phon="bad", date="3/7/20"),
+            read_data.LexiconRow(3, phon="blank"),
+        ]
+        rtn = process_data.validate_date_format(data)
+        self.assertEqual(
+            ["bad has date 3/7/20, which isn't formatted as a date"], rtn.error_data
+        )
+
+    def test_validate_near_duplicates(self):
+        data = [
+            read_data.LexiconRow(1, "", "undum"),
+            read_data.LexiconRow(1, "", "undum", sense=2),
+            read_data.LexiconRow(2, "", "undúm"),  # differs by a diacritic
+            read_data.LexiconRow(3, "ɛlɛ", "elɛ"),  # orthography of the same word
+            read_data.LexiconRow(4, "", "eli"),
+            read_data.LexiconRow(5, "", "sinasim"),
+            read_data.LexiconRow(6, "", "mu"),  # too short to check
+            read_data.LexiconRow(7, "", "ma"),
+        ]
+        rtn = process_data.validate_near_duplicates(data)
+        self.assertEqual(
+            ["undum and undúm are 1 edit apart", "elɛ and eli are 1 edit apart"],
+            rtn.error_data,
+        )
+        settings = fixtures.settings.copy()
+        settings["near_duplicate_distance"] = 2
+        with patch("lexicon_config.settings", settings):
+            rtn = process_data.validate_near_duplicates(data)
+        self.assertIn("ɛlɛ and eli are 2 edits apart", rtn.error_data)
+
 
 class DataProcessingTests(unittest.TestCase):
     """Test all the functions that process and reorganise data read from spreadsheet"""
@@ -181,6 +334,7 @@ class DataProcessingTests(unittest.TestCase):
             [
                 {
                     "definition": "A large person",
+                    "dialect": "",
                     "english": "dad",
                     "example": "ɛŋ inda",
                     "example_translation": "my dad",
@@ -249,6 +403,17 @@ class DataProcessingTests(unittest.TestCase):
             [process_data.LexiconEntry("Test", {})], "test"
         )
 
+    def test_group_by_letter(self):
+        entries = [
+            process_data.LexiconEntry(w, {}) for w in ("ab", "Ac", "ad", "ɛn", "en")
+        ]
+        sections = process_data.group_by_letter(entries)
+        self.assertEqual(["a", "e", "ɛ"], [letter for letter, _ in sections])
+        letter, (left, right) = sections[0]
+        self.assertEqual(["ab", "Ac"], [e.headword for e in left])
+        self.assertEqual(["ad"], [e.headword for e in right])
+        self.assertEqual(([entries[4]], []), sections[1][1])
+
     def test_get_word_beginnings_returns_in_alphabetical_order(self):
         data = process_data.get_word_beginnings(fixtures.jumbled_lexicon_entries)
 
@@ -1,4 +1,5 @@
 import datetime
+import types
 import unittest
 from unittest.mock import patch
 
@@ -14,7 +15,7 @@ class ReadLexiconTests(unittest.TestCase):
         data = read_data.read_lexicon(config_file=tests.fixtures)
 
         self.assertEqual(type(data), list, "Wrong data type returned")
-        self.assertEqual(type(data[0]), dict, "Wrong data type returned")
+        self.assertIsInstance(data[0], read_data.LexiconRow, "Wrong data type returned")
 
     def test_read_lexicon_all_rows_read(self):
         data = read_data.read_lexicon(config_file=tests.fixtures)
@@ -99,6 +100,21 @@ class ReadLexiconTests(unittest.TestCase):
             "First row not as expected",
         )
 
+    def test_stream_lexicon_matches_read_lexicon(self):
+        stream = read_data.stream_lexicon(config_file=tests.fixtures)
+        self.assertIsInstance(stream, types.GeneratorType, "Rows not streamed")
+        rows = list(stream)
+        self.assertEqual(
+            ["undum", "mut", "grɑs", "limoŋ", "mut"],
+            [r["phon"] for r in rows],
+            "Streamed rows not in spreadsheet order",
+        )
+        self.assertEqual(
+            sorted(rows, key=lambda r: r["id"]),
+            read_data.read_lexicon(config_file=tests.fixtures),
+            "Streamed rows differ from read_lexicon()",
+        )
+
     def test_read_lexicon_settings_column_undefined(self):
         with patch("tests.fixtures.spreadsheet_config", {"id_col": "A"}):
             with self.assertRaises(AssertionError) as error:
@@ -227,6 +243,32 @@ class ReadLexiconTests(unittest.TestCase):
                     )
 
 
+class LexiconRowTests(unittest.TestCase):
+    """Test the record used for each row of the lexicon"""
+
+    def test_lexicon_row_attribute_and_item_access(self):
+        row = read_data.LexiconRow(id=1, phon="undum", definition="A small person")
+        self.assertEqual("undum", row.phon)
+        self.assertEqual("undum", row["phon"])
+        self.assertEqual("A small person", row["def"])
+        row["sense"] = 2
+        self.assertEqual(2, row.sense, "Item assignment not stored")
+        with self.assertRaises(KeyError):
+            row["made_up"]
+
+    def test_lexicon_row_acts_as_dict(self):
+        d = {k: "" for k in read_data.LexiconRow.fields}
+        d.update({"id": 1, "sense": 1, "phon": "undum"})
+        row = read_data.LexiconRow.from_dict(d)
+        self.assertEqual(d, row, "Row not equal to the equivalent dict")
+        self.assertEqual(d, dict(row), "Row doesn't convert to a dict")
+        self.assertEqual(18, len(row))
+
+    def test_lexicon_row_has_no_instance_dict(self):
+        row = read_data.LexiconRow()
+        self.assertFalse(hasattr(row, "__dict__"), "Row isn't using __slots__")
+
+
 class SupportingFunctionsTests(unittest.TestCase):
     """Tests the functions supporting read_lexicon()"""
 
@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from application_code import process_data
+from application_code import search
+from tests import fixtures
+
+
+class SearchIndexTests(unittest.TestCase):
+    """Test the search index used by the dictionary page's filter"""
+
+    def setUp(self):
+        verb_data = [
+            [1, "1s", "future", "", "ɛlɛ", "go"],
+            [1, "1s", "recent past", "", "ɛ́lɛpum", "go"],
+        ]
+        entries = process_data.create_lexicon_entries(
+            fixtures.good_processed_data, verb_data
+        )
+        self.sections = process_data.group_by_letter(entries)
+        self.index = search.build_search_index(self.sections)
+
+    def matches(self, field, text):
+        """Search the index the same way filter_js.html does"""
+        index = self.index["fields"][field]
+        candidates = range(len(index["texts"]))
+        for gram in search.grams(text):
+            candidates = [c for c in candidates if c in index["grams"].get(gram, [])]
+        return [c for c in candidates if text in index["texts"][c]]
+
+    def test_entries_numbered_in_page_order(self):
+        numbers = [
+            entry.number
+            for _, columns in self.sections
+            for column in columns
+            for entry in column
+        ]
+        self.assertEqual(list(range(len(numbers))), numbers)
+        self.assertEqual(len(numbers), len(self.index["letters"]))
+
+    def test_search_fields(self):
+        entries = {
+            e.number: e for _, columns in self.sections for c in columns for e in c
+        }
+        for field, text, headword in (
+            ("kovol", "sinasim", "sinasim"),
+            ("kovol", "ndu", "undum__"),  # phonetics of an entry with orthography
+            ("english", "chi", "undum__"),
+            ("tok_pisin", "papa", "inda"),
+        ):
+            found = [entries[n].headword for n in self.matches(field, text)]
+            self.assertEqual([headword], found, "{t} not found".format(t=text))
+        verb = self.matches("kovol", "pum")
+        self.assertEqual(["ɛlɛ"], [entries[n].headword for n in verb])
+        folded = self.matches("kovol", "elepum")
+        self.assertEqual(["ɛlɛ"], [entries[n].headword for n in folded])
+        self.assertEqual([], self.matches("english", "imaginary"))
+
+    def test_fold(self):
+        self.assertEqual("e", self.index["fold"]["ɛ"])
+        self.assertEqual("k", self.index["fold"]["ʔ"])
+
+    def test_grams(self):
+        self.assertEqual({"abc", "bcd"}, search.grams("abcd"))
+        self.assertEqual({"abc"}, search.grams("abc\nde"), "Gram spans two values")
+
+    def test_write_search_index(self):
+        folder = tempfile.mkdtemp()
+        try:
+            path = search.write_search_index(self.index, folder)
+            with open(path, encoding="utf-8") as file:
+                contents = file.read()
+            files = os.listdir(folder)
+        finally:
+            shutil.rmtree(folder)
+        self.assertEqual(os.path.join(folder, "search_index.js"), path)
+        self.assertEqual(["search_index.js"], files, "Temporary file left behind")
+        prefix = "var search_index = "
+        self.assertTrue(contents.startswith(prefix))
+        self.assertEqual(self.index, json.loads(contents[len(prefix) :].rstrip(";\n")))
+
+    def test_write_search_index_failed(self):
+        folder = tempfile.mkdtemp()
+        try:
+            search.write_search_index(self.index, folder)
+            with self.assertRaises(TypeError):
+                search.write_search_index({"letters": object()}, folder)
+            with open(
+                os.path.join(folder, "search_index.js"), encoding="utf-8"
+            ) as file:
+                contents = file.read()
+            files = os.listdir(folder)
+        finally:
+            shutil.rmtree(folder)
+        self.assertIn('"letters"', contents)
+        self.assertTrue(contents.endswith(";\n"), "Index half written")
+        self.assertEqual(["search_index.js"], files)
@@ -0,0 +1,133 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import pyexcel_ods3
+import pyexcel_xls
+
+import tests.fixtures
+from application_code import read_data
+from application_code import spreadsheets
+
+CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+    xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+<office:body><office:spreadsheet>
+<table:table table:name="Other">
+    <table:table-row><table:table-cell office:value-type="string"><text:p>skip me</text:p></table:table-cell>
+    </table:table-row>
+</table:table>
+<table:table table:name="Sheet1">
+    <table:table-row>
+        <table:table-cell office:value-type="float" office:value="3"/>
+        <table:table-cell table:number-columns-repeated="2"/>
+        <table:table-cell office:value-type="string"><text:p>a<text:s text:c="2"/>b</text:p></table:table-cell>
+        <table:table-cell office:value-type="date" office:date-value="2020-04-30"/>
+        <table:table-cell office:value-type="float" office:value="1.5" table:number-columns-repeated="2"/>
+        <table:table-cell table:number-columns-repeated="1000"/>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="2">
+        <table:table-cell table:number-columns-repeated="1024"/>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="2">
+        <table:table-cell office:value-type="boolean" office:boolean-value="true"/>
+        <table:table-cell office:value-type="string"><text:p><text:span>span</text:span></text:p></table:table-cell>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="1048570">
+        <table:table-cell table:number-columns-repeated="1024"/>
+    </table:table-row>
+</table:table>
+</office:spreadsheet></office:body>
+</office:document-content>
+"""
+
+
+class ODSReaderTests(unittest.TestCase):
+    """Test the streaming lxml .ods reader"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.ods = os.path.join(self.folder, "test.ods")
+        with zipfile.ZipFile(self.ods, "w") as ods:
+            ods.writestr("content.xml", CONTENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_read_ods_sheet_values(self):
+        rows = list(spreadsheets.read_ods_sheet(self.ods, "Sheet1"))
+        self.assertEqual(
+            [
+                [3, "", "", "a  b", datetime.date(2020, 4, 30), 1.5, 1.5],
+                [],
+                [],
+                [True, "span"],
+                [True, "span"],
+            ],
+            rows,
+        )
+
+    def test_read_ods_sheet_missing_sheet(self):
+        with self.assertRaises(KeyError):
+            list(spreadsheets.read_ods_sheet(self.ods, "ImaginarySheet"))
+
+    def test_read_ods_sheet_matches_pyexcel(self):
+        for spreadsheet in ("good_data.ods", "bad_data.ods"):
+            spreadsheet = os.path.join("tests", "test_data", spreadsheet)
+            for sheet, expected in pyexcel_ods3.get_data(spreadsheet).items():
+                while expected and expected[-1] == []:
+                    expected.pop()  # trailing blank rows aren't returned
+                rows = list(spreadsheets.read_ods_sheet(spreadsheet, sheet))
+                self.assertEqual(expected, rows, "{s} read differently".format(s=sheet))
+
+    def test_read_lexicon_with_lxml_reader(self):
+        settings = tests.fixtures.settings.copy()
+        settings["ods_reader"] = "lxml"
+        expected = read_data.read_lexicon(config_file=tests.fixtures)
+        with patch("tests.fixtures.settings", settings):
+            data = read_data.read_lexicon(config_file=tests.fixtures)
+        self.assertEqual(expected, data, "lxml reader gives different data")
+
+
+class ExcelReaderTests(unittest.TestCase):
+    """Test the streaming .xlsx and .xls readers"""
+
+    xls = os.path.join("tests", "test_data", "test_xls.xls")
+    xlsx = os.path.join("tests", "test_data", "test_xlsx.xlsx")
+
+    def test_read_sheet_chooses_reader_by_extension(self):
+        with patch("application_code.spreadsheets.read_xlsx_sheet") as reader:
+            spreadsheets.read_sheet(self.xlsx, "Sheet1")
+            reader.assert_called_once_with(self.xlsx, "Sheet1")
+        with patch("application_code.spreadsheets.read_xls_sheet") as reader:
+            spreadsheets.read_sheet(self.xls, "Sheet1")
+            reader.assert_called_once_with(self.xls, "Sheet1")
+
+    def test_read_xls_sheet_matches_pyexcel(self):
+        expected = pyexcel_xls.get_data(self.xls)["Sheet1"]
+        self.assertEqual(
+            expected, list(spreadsheets.read_xls_sheet(self.xls, "Sheet1"))
+        )
+
+    def test_excel_readers_agree(self):
+        xls_rows = list(spreadsheets.read_xls_sheet(self.xls, "Sheet1"))
+        xlsx_rows = list(spreadsheets.read_xlsx_sheet(self.xlsx, "Sheet1"))
+        self.assertEqual(xls_rows, xlsx_rows, "xls and xlsx give different rows")
+        self.assertEqual(datetime.date(2020, 4, 30), xlsx_rows[1][11])
+        self.assertEqual([2, "", "mut", "", "", "n", "dead", "dai"], xlsx_rows[5])
+
+    def test_excel_readers_missing_sheet(self):
+        with self.assertRaises(KeyError):
+            list(spreadsheets.read_xls_sheet(self.xls, "ImaginarySheet"))
+        with self.assertRaises(KeyError):
+            list(spreadsheets.read_xlsx_sheet(self.xlsx, "ImaginarySheet"))
+
+    def test_trimmed_rows(self):
+        rows = [["a", "", ""], ["", ""], [], ["b"], ["", ""]]
+        self.assertEqual([["a"], [], [], ["b"]], list(spreadsheets.trimmed_rows(rows)))
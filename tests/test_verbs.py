@@ -0,0 +1,68 @@
+import unittest
+
+from application_code import process_data
+from application_code import verbs
+
+PARADIGM = [
+    ("1s", "future", "", "ɛlɛ", "go"),
+    ("2s", "Future", "imperative", "ɛla", "go"),
+    ("2s", "future", "", "ɛlɛŋ", "go"),
+    ("3P", "remote past", "", "ɛlɛmɔŋ", "go"),
+    ("", "", "short", "ɛl", "go"),
+    ("1s", "future", "", "ŋa", "eat"),
+    ("2p", "recent past", "", "ŋaŋ", "eat"),
+]
+
+
+class VerbTests(unittest.TestCase):
+    """Test building KovolVerb objects from the paradigm sheet"""
+
+    def test_conjugation_slots(self):
+        self.assertEqual(("future_1s",), verbs.conjugation_slots("Future", "1S", ""))
+        self.assertEqual(
+            ("singular_imperative",),
+            verbs.conjugation_slots("future", "2s", "imperative"),
+        )
+        self.assertEqual(
+            ("recent_past_2p", "plural_imperative"),
+            verbs.conjugation_slots("recent past", "2p", "Imperative"),
+        )
+        self.assertEqual(("short",), verbs.conjugation_slots("", "", "Short"))
+        self.assertEqual((), verbs.conjugation_slots("present", "1s", ""))
+
+    def test_paradigm_rows_to_verbs(self):
+        eat, go = verbs.paradigm_rows_to_verbs(PARADIGM)
+        self.assertEqual(
+            ("eat", "ŋa", "ŋaŋ"), (eat.english, eat.future_1s, eat.recent_past_2p)
+        )
+        self.assertEqual("ɛlɛŋ", go.future_2s, "Imperative used as future form")
+        self.assertEqual("ɛla", go.singular_imperative)
+        self.assertEqual("ɛlɛmɔŋ", go.remote_past_3p)
+        self.assertEqual("ɛl", go.short)
+
+    def test_kovol_verb_compact(self):
+        verb = verbs.KovolVerb("ɛlɛ", "go")
+        self.assertFalse(hasattr(verb, "__dict__"), "Verb isn't using __slots__")
+        self.assertEqual("", verb.future_3p)
+        other = verbs.KovolVerb("ɛlɛ", "go")
+        self.assertEqual(verb, other)
+        self.assertEqual(hash(verb), hash(other))
+        other.short = "ɛl"
+        self.assertNotEqual(verb, other)
+        self.assertEqual('Kovol verb: ɛlɛ, "go"', str(verb))
+
+    def test_create_verb_lexicon_entries(self):
+        verb_data = [["ID", "actor", "tense", "mode", "kov", "eng"]]
+        verb_data += [[1] + list(row) for row in PARADIGM]
+        entries = process_data.create_verb_lexicon_entries(verb_data)
+        self.assertEqual(["ŋa", "ɛlɛ"], [e.headword for e in entries])
+        self.assertIsInstance(entries[1].entry[0], verbs.KovolVerb)
+        self.assertEqual("ID", verb_data[0][0], "Header removed from caller's list")
+
+    def test_get_verb_conjugations(self):
+        verb_data = [["ID", "actor", "tense", "mode", "kov", "eng"]]
+        verb_data += [[1] + list(row) for row in PARADIGM]
+        self.assertEqual(
+            [row[3] for row in PARADIGM],
+            process_data.get_verb_conjugations(verb_data),
+        )
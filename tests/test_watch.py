@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from application_code import watch
+
+
+class WatchTests(unittest.TestCase):
+    """Test the file watcher used by lexicon.py --watch"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.lexicon = os.path.join(self.folder, "lexicon.ods")
+        self.verbs = os.path.join(self.folder, "verbs.ods")
+        for path in (self.lexicon, self.verbs):
+            self.save(path, "contents")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def save(self, path, contents):
+        with open(path, "w") as file:
+            file.write(contents)
+        # make sure the mtime changes even on file systems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def watcher(self, edits):
+        """Start watching with a fake sleep that makes edits[n] (a list of (path, contents)) on the nth check"""
+        self.checks = 0
+
+        def sleep(seconds):
+            self.checks += 1
+            for path, contents in edits.get(self.checks, []):
+                if contents is None:
+                    os.remove(path)
+                else:
+                    self.save(path, contents)
+
+        return watch.watch([self.lexicon, self.verbs], debounce=2, sleep=sleep)
+
+    def test_change_detected(self):
+        watcher = self.watcher({3: [(self.lexicon, "edited")]})
+        self.assertEqual({self.lexicon}, next(watcher))
+        self.assertEqual(5, self.checks, "Didn't wait for the file to settle")
+
+    def test_autosaves_debounced(self):
+        edits = {
+            1: [(self.lexicon, "autosave 1")],
+            2: [(self.lexicon, "autosave 2")],
+            3: [(self.verbs, "edited"), (self.lexicon, "autosave 3")],
+            6: [(self.lexicon, "edited again")],
+        }
+        watcher = self.watcher(edits)
+        self.assertEqual({self.lexicon, self.verbs}, next(watcher))
+        self.assertEqual(5, self.checks, "Burst of saves not treated as one")
+        self.assertEqual({self.lexicon}, next(watcher))
+        self.assertEqual(8, self.checks)
+
+    def test_file_replaced_during_save(self):
+        edits = {1: [(self.lexicon, None)], 2: [(self.lexicon, "saved")]}
+        watcher = self.watcher(edits)
+        self.assertEqual({self.lexicon}, next(watcher))
+        self.assertEqual(4, self.checks)
+
+    def test_file_states(self):
+        missing = os.path.join(self.folder, "missing.ods")
+        states = watch.file_states([self.lexicon, missing])
+        self.assertEqual(len("contents"), states[self.lexicon][1])
+        self.assertIsNone(states[missing])
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from application_code import process_data
+from application_code import wordforms
+from tests import fixtures
+
+VERB_DATA = [
+    ["ID", "actor", "tense", "mode", "kov", "eng"],
+    [7, "1s", "future", "", "ɛlɛ", "go"],
+    [7, "1s", "recent past", "", "ɛlɛpum", "go"],
+    [7, "2s", "future", "imperative", "ɛla", "go"],
+]
+
+
+class WordFormIndexTests(unittest.TestCase):
+    """Test the memory mapped index of every Kovol word form"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, wordforms.INDEX_FILE)
+        self.word_forms = process_data.get_word_forms(
+            fixtures.good_processed_data, VERB_DATA
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_get_word_forms(self):
+        self.assertEqual(sorted(self.word_forms), self.word_forms)
+        self.assertIn(("elepum", "ɛlɛpum", "7", "recent_past_1s"), self.word_forms)
+        self.assertIn(("ela", "ɛla", "7", "singular_imperative"), self.word_forms)
+        self.assertIn(("undum", "undum", "1", ""), self.word_forms)
+        self.assertNotIn("kov", [f[1] for f in self.word_forms], "Header included")
+
+    def test_lookup(self):
+        wordforms.write_index(self.word_forms, self.path)
+        with wordforms.WordFormIndex(self.path) as index:
+            self.assertEqual(len(self.word_forms), len(index))
+            self.assertEqual(
+                [("ɛlɛpum", "7", "recent_past_1s")], index.lookup("elepum")
+            )
+            self.assertEqual([("inda", "2", "")], index.lookup("Inda"))
+            self.assertIn("ɛlɛ", index)
+            self.assertNotIn("zzz", index)
+            self.assertNotIn("", index)
+            for key, *_ in self.word_forms:
+                self.assertIn(key, index)
+
+    def test_empty_index(self):
+        wordforms.write_index([], self.path)
+        with wordforms.WordFormIndex(self.path) as index:
+            self.assertEqual(0, len(index))
+            self.assertEqual([], index.lookup("undum"))
+
+    def test_not_an_index(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not an index")
+        with self.assertRaises(ValueError):
+            wordforms.WordFormIndex(self.path)